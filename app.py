@@ -1,29 +1,126 @@
+import io
+import json
+import os
 import traceback
-from flask import Flask, render_template, request, jsonify
-from antlr4 import *
-from antlr4.error.ErrorListener import ErrorListener
-from src.TimelineLexer import TimelineLexer
-from src.TimelineParser import TimelineParser
-from src.TimelineInterpreter import TimelineInterpreter, ValidationError
-import matplotlib
-matplotlib.use('Agg')
+from flask import Flask, render_template, request, jsonify, Response
+from src import pipeline, timings
+from src.compile_cache import CompileCache
+from src.image_store import ImageStore
+from src.render_pool import RenderPool
+from src.render_cache import RenderCache
+from src.warmup import warm_up
+from src.incremental import IncrementalFrontend
+from src.models.date import interned_dates
+
+# matplotlib is only imported when the first PNG is rendered; select the
+# non-interactive backend for it up front without importing it here
+os.environ.setdefault('MPLBACKEND', 'Agg')
 
 app = Flask(__name__)
 
+# Compile cache settings (size 0 disables the cache, TTL is in seconds)
+app.config['COMPILE_CACHE_SIZE'] = int(os.environ.get('TIMELINE_COMPILE_CACHE_SIZE', 128))
+app.config['COMPILE_CACHE_TTL'] = float(os.environ['TIMELINE_COMPILE_CACHE_TTL']) if os.environ.get('TIMELINE_COMPILE_CACHE_TTL') else None
+
+# Parse in SLL mode first and fall back to full LL only on failure (opt-in)
+app.config['PARSE_TWO_STAGE'] = os.environ.get('TIMELINE_PARSE_TWO_STAGE', '0').lower() in ('1', 'true', 'yes')
+
+# Lexer implementation: 'antlr' (generated TimelineLexer) or 'fast' (hand-written TimelineFastLexer)
+app.config['LEXER'] = os.environ.get('TIMELINE_LEXER', 'antlr').lower()
+
+# Re-parse only the declarations that changed since earlier requests (opt-in)
+app.config['INCREMENTAL_PARSE'] = os.environ.get('TIMELINE_INCREMENTAL_PARSE', '0').lower() in ('1', 'true', 'yes')
+
+# Populate the shared ANTLR DFA caches before serving the first request
+app.config['WARMUP'] = os.environ.get('TIMELINE_WARMUP', '1').lower() in ('1', 'true', 'yes')
+
+# Stop lexing and parsing after this many errors (0 collects every error)
+app.config['MAX_ERRORS'] = int(os.environ.get('TIMELINE_MAX_ERRORS', 0))
+
+# Return image handles from /visualize and render each PNG when it is first requested (opt-in)
+app.config['DEFER_IMAGES'] = os.environ.get('TIMELINE_DEFER_IMAGES', '0').lower() in ('1', 'true', 'yes')
+app.config['IMAGE_STORE_SIZE'] = int(os.environ.get('TIMELINE_IMAGE_STORE_SIZE', 256))
+
+# Render timeline PNGs in this many pre-warmed worker processes (0 renders on the request thread)
+app.config['RENDER_WORKERS'] = int(os.environ.get('TIMELINE_RENDER_WORKERS', 0))
+
+# Reuse PNGs of identical timelines across requests (0 only reuses them within a request)
+app.config['RENDER_CACHE_SIZE'] = int(os.environ.get('TIMELINE_RENDER_CACHE_SIZE', 0))
+
+# Share one Date object per distinct date across components, ticks and requests (0 turns interning off)
+app.config['DATE_CACHE_SIZE'] = int(os.environ.get('TIMELINE_DATE_CACHE_SIZE', 65536))
+
+# Time the phases of every request, log them and add them to the response (requests can also ask with options.timings)
+app.config['TIMINGS'] = os.environ.get('TIMELINE_TIMINGS', '0').lower() in ('1', 'true', 'yes')
+
+compile_cache = CompileCache(app.config['COMPILE_CACHE_SIZE'], app.config['COMPILE_CACHE_TTL'])
+incremental_frontend = IncrementalFrontend(lexer=app.config['LEXER'])
+render_pool = RenderPool(app.config['RENDER_WORKERS']) if app.config['RENDER_WORKERS'] > 0 else None
+render_cache = RenderCache(app.config['RENDER_CACHE_SIZE']) if app.config['RENDER_CACHE_SIZE'] > 0 else None
+image_store = ImageStore(app.config['IMAGE_STORE_SIZE'], render_pool) if app.config['DEFER_IMAGES'] else None
+interned_dates.max_size = app.config['DATE_CACHE_SIZE']
+
+if app.config['WARMUP']:
+    warmup_count, warmup_time = warm_up(two_stage=app.config['PARSE_TWO_STAGE'])
+    print(f"[Info] Parser warm-up: parsed {warmup_count} scripts in {warmup_time * 1000:.1f} ms")
+
+if render_pool is not None:
+    # Start the workers (and load matplotlib in them) before the first request
+    print(f"[Info] Render pool: {render_pool.workers} workers ready in {render_pool.warm() * 1000:.1f} ms")
+
+
+def option_enabled(options, name):
+    """Whether the boolean request option name is set"""
+    return str(options.get(name, '')).lower() in ('1', 'true', 'yes')
+
 
-# Custom error listener to capture parser errors
-class TimelineErrorListener(ErrorListener):
-    def __init__(self):
-        self.errors = []
+def error_budget(options=None):
+    """Return the error budget for a request: the server's MAX_ERRORS, lowered by options.
 
-    def syntaxError(self, recognizer, offendingSymbol, line, column, msg, e):
-        error = {
-            'line': line,
-            'column': column,
-            'message': msg,
-            'symbol': offendingSymbol.text if offendingSymbol else None
-        }
-        self.errors.append(error)
+    options may set 'max_errors' to a smaller budget, or 'first_error' to stop at the
+    first error (lint-while-typing mode).
+    """
+    budgets = [app.config['MAX_ERRORS']]
+    if options:
+        if option_enabled(options, 'first_error'):
+            budgets.append(1)
+        if options.get('max_errors'):
+            budgets.append(int(options['max_errors']))
+    budgets = [budget for budget in budgets if budget > 0]
+    return min(budgets) if budgets else None
+
+
+def timings_requested(options):
+    return app.config['TIMINGS'] or option_enabled(options, 'timings')
+
+
+def log_timings(request_timings, endpoint, **fields):
+    """Log a request's phase timings as one JSON line, returning them for the response"""
+    summary = request_timings.to_dict()
+    print(f"[Info] timings {json.dumps({'endpoint': endpoint, **fields, **summary})}")
+    return summary
+
+
+def compile_timeline(timeline_code, max_errors=None, render=True, debug=False):
+    """Compile the code with the configured front-end, returning the /visualize response payload"""
+    return pipeline.compile_timeline(
+        timeline_code,
+        lexer_kind=app.config['LEXER'],
+        two_stage=app.config['PARSE_TWO_STAGE'],
+        incremental=incremental_frontend if app.config['INCREMENTAL_PARSE'] else None,
+        max_errors=max_errors,
+        render=render,
+        image_store=image_store,
+        render_pool=render_pool,
+        render_cache=render_cache,
+        debug=debug
+    )
+
+
+def images_available(payload):
+    """Whether every deferred image in a cached payload can still be rendered from the image store"""
+    return all(component['image_handle'] in image_store
+               for component in payload.get('components', ()) if 'image_handle' in component)
 
 
 @app.route('/')
@@ -51,112 +148,118 @@ def visualize():
                 'error_type': 'export_missing'
             })
 
-        # Process the timeline code directly from memory
-        input_stream = InputStream(timeline_code)
-        lexer = TimelineLexer(input_stream)
-        lexer_error_listener = TimelineErrorListener()
-        lexer.removeErrorListeners()
-        lexer.addErrorListener(lexer_error_listener)
-        tokens = CommonTokenStream(lexer)
-        parser = TimelineParser(tokens)
-        parser_error_listener = TimelineErrorListener()
-        parser.removeErrorListeners()
-        parser.addErrorListener(parser_error_listener)
-
-        # Check for lexer errors first
-        if lexer_error_listener.errors:
-            return jsonify({
-                'success': False,
-                'error': 'Lexical Errors:',
-                'parser_errors': lexer_error_listener.errors,
-                'error_type': 'lexer_error'
-            })
+        options = request.json.get('options') or {}
+        with timings.recording(timings_requested(options)) as request_timings:
+            # Identical code (and options) always compiles to the same payload
+            cache_key = CompileCache.make_key(timeline_code, {k: v for k, v in options.items() if k != 'timings'})
+            payload = compile_cache.get(cache_key)
+            cache_hit = payload is not None and images_available(payload)
+            if not cache_hit:
+                payload = compile_timeline(timeline_code, max_errors=error_budget(options),
+                                           debug=option_enabled(options, 'debug'))
+                compile_cache.put(cache_key, payload)
 
-        # Parse the input
-        tree = parser.program()
+        if request_timings is not None:
+            # Cached payloads are shared between requests, so the timings go on a copy
+            payload = dict(payload, timings=log_timings(request_timings, '/visualize', cache='hit' if cache_hit else 'miss'))
+        return jsonify(payload)
+        
+    except Exception as e:
+        return jsonify(runtime_error_payload(e))
 
-        # Check for parser errors
-        if parser_error_listener.errors:
-            return jsonify({
-                'success': False,
-                'error': 'Syntax Errors:',
-                'parser_errors': parser_error_listener.errors,
-                'error_type': 'parser_error'
-            })
 
-        # Run the interpreter
-        interpreter = TimelineInterpreter()
-        try:
-            result = interpreter.visit(tree)
-        except ValidationError as e:
-            # Return the validation error with line and column information
-            print(f"Validation error at line {e.line}, column {e.column}: {str(e)}")
-            return jsonify({
-                'success': False,
-                'error': 'Validation Error:',
-                'validation_errors': interpreter.interpretation_errors,
-                'error_type': 'validation_error'
-            })
-        except NameError as e:
-            print(e)
-            return jsonify({
-                'success': False,
-                'error': 'Name Error:',
-                'name_errors': interpreter.interpretation_errors,
-                'error_type': 'name_error'
-            })
-        except LookupError as e:
-            print(e)
-            return jsonify({
-                'success': False,
-                'error': 'Lookup Error:',
-                'lookup_errors': interpreter.interpretation_errors,
-                'error_type': 'lookup_error'
-            })
-        except TypeError as e:
-            print(e)
-            return jsonify({
-                'success': False,
-                'error': 'Type Error:',
-                'type_errors': interpreter.interpretation_errors,
-                'error_type': 'type_error'
-            })
-        except AttributeError as e:
-            print(e)
+@app.route('/validate', methods=['POST'])
+def validate():
+    """Lint the code without rendering anything, returning the same errors as /visualize"""
+    try:
+        timeline_code = request.json.get('code', '')
+        options = request.json.get('options') or {}
+        with timings.recording(timings_requested(options)) as request_timings:
+            # Not cached: results are cheap to recompute and would evict rendered payloads
+            payload = compile_timeline(timeline_code, max_errors=error_budget(options), render=False,
+                                       debug=option_enabled(options, 'debug'))
+
+        if request_timings is not None:
+            payload['timings'] = log_timings(request_timings, '/validate')
+        return jsonify(payload)
+
+    except Exception as e:
+        return jsonify(runtime_error_payload(e))
+
+
+@app.route('/visualize/upload', methods=['POST'])
+def visualize_upload():
+    """Visualize an uploaded .timeline file, streaming it one declaration at a time"""
+    try:
+        upload = request.files.get('file')
+        if upload is None:
             return jsonify({
                 'success': False,
-                'error': 'Type Error:',
-                'attribute_errors': interpreter.interpretation_errors,
-                'error_type': 'attribute_error'
+                'error': 'No file uploaded. Send the script as the "file" field of a multipart form.',
+                'error_type': 'file_missing'
             })
 
+        stream = io.TextIOWrapper(upload.stream, encoding='utf-8')
+        with timings.recording(timings_requested(request.form)) as request_timings:
+            payload = pipeline.stream_timeline(stream, lexer_kind=app.config['LEXER'], max_errors=error_budget(request.form),
+                                               image_store=image_store, render_pool=render_pool,
+                                               render_cache=render_cache)
+
+        if request_timings is not None:
+            payload['timings'] = log_timings(request_timings, '/visualize/upload')
+        return jsonify(payload)
+
+    except Exception as e:
+        return jsonify(runtime_error_payload(e))
+
+
+@app.route('/visualize/image/<handle>', methods=['GET'])
+def visualize_image(handle):
+    """Serve the PNG of a timeline exported by /visualize, rendering it on first request"""
+    try:
+        with timings.recording(timings_requested(request.args)) as request_timings:
+            png = image_store.png(handle) if image_store is not None else None
 
-        if not interpreter.exported_components:
+        if request_timings is not None:
+            log_timings(request_timings, '/visualize/image', handle=handle)
+        if png is None:
             return jsonify({
                 'success': False,
-                'error': 'No timeline was exported. Add an export command in the main block to visualize the timeline.',
-                'error_type': 'export_missing'
-            })
+                'error': 'Image not found. It may have expired; visualize the timeline again.',
+                'error_type': 'image_missing'
+            }), 404
+
+        # A handle is a hash of the timeline it renders, so the image never changes
+        return Response(png, mimetype='image/png', headers={'Cache-Control': 'public, max-age=31536000, immutable'})
 
-        # Return the components that were rendered by the interpreter
-        return jsonify({
-            'success': True,
-            'components': interpreter.exported_components
-        })
-        
     except Exception as e:
-        error_details = {
-            'message': str(e),
-            'traceback': traceback.format_exc() if app.debug else None
-        }
-        if app.debug:
-            print(error_details)
-        return jsonify({
-            'success': False,
-            'error': 'An unexpected error occurred',
-            'error_details': error_details,
-            'error_type': 'runtime_error'
-        })
+        return jsonify(runtime_error_payload(e)), 500
+
+
+def runtime_error_payload(e):
+    error_details = {
+        'message': str(e),
+        'traceback': traceback.format_exc() if app.debug else None
+    }
+    if app.debug:
+        print(error_details)
+    return {
+        'success': False,
+        'error': 'An unexpected error occurred',
+        'error_details': error_details,
+        'error_type': 'runtime_error'
+    }
+
+
+@app.route('/cache/stats', methods=['GET'])
+def cache_stats():
+    return jsonify({
+        'compile_cache': compile_cache.stats(),
+        'incremental_frontend': incremental_frontend.stats(),
+        'image_store': image_store.stats() if image_store is not None else None,
+        'render_cache': render_cache.stats() if render_cache is not None else None,
+        'dates': interned_dates.stats()
+    })
 
 
 if __name__ == '__main__':
@@ -0,0 +1,42 @@
+"""Compare compiling a script from source against loading its on-disk compiled cache.
+
+Run from the repository root:
+    python -m benchmarks.bench_compiled_cache [n_declarations]
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from src import compiled_cache, pipeline
+from benchmarks.synthetic import generate_script
+
+
+def timed(fn):
+    """Run fn with stdout silenced, returning (seconds, payload)"""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        payload = fn()
+    return time.perf_counter() - start, payload
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'synthetic.timeline')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(generate_script(size, export=False))
+
+        cold, cold_payload = timed(lambda: pipeline.compile_file(path))
+        warm, warm_payload = timed(lambda: pipeline.compile_file(path))
+        assert cold_payload == warm_payload, (cold_payload, warm_payload)
+
+        print(f"declarations: {size} ({os.path.getsize(path) / 1e6:.1f} MB source, "
+              f"{os.path.getsize(compiled_cache.cache_path(path)) / 1e6:.1f} MB cache)")
+        print(f"parse + write cache {cold:8.2f} s")
+        print(f"load cache          {warm:8.2f} s   ({cold / warm:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
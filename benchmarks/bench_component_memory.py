@@ -0,0 +1,115 @@
+"""Measure memory per component with the old __dict__ layout and the slotted models.
+
+The dict-based classes below are the models as they were before __slots__, with
+importance and relationship types stored as strings. Both builds share the same
+interned dates, ids and titles, so the difference is the objects' own layout.
+
+Run from the repository root:
+    python -m benchmarks.bench_component_memory [n_components]
+"""
+import sys
+import time
+import tracemalloc
+from src.models import Event, Period, Relationship
+from src.models.date import interned_dates
+
+IMPORTANCE_LEVELS = ["high", "medium", "low"]
+RELATIONSHIP_TYPES = ["precedes", "cause-effect", "related"]
+
+
+class DictComponent:
+    def __init__(self, id, title, importance="MEDIUM"):
+        self.id = id
+        self.title = title
+        self._importance = None
+        self.importance = importance
+
+    @property
+    def importance(self):
+        return self._importance
+
+    @importance.setter
+    def importance(self, value):
+        valid_importance = ["HIGH", "MEDIUM", "LOW"]
+        if value.upper() not in valid_importance:
+            raise ValueError(f"Importance must be one of {valid_importance}")
+        self._importance = value.upper()
+
+
+class DictEvent(DictComponent):
+    def __init__(self, id, title, date, importance="MEDIUM"):
+        super().__init__(id, title, importance)
+        self.date = interned_dates.from_dict(date)
+
+
+class DictPeriod(DictComponent):
+    def __init__(self, id, title, start, end, importance="MEDIUM"):
+        super().__init__(id, title, importance)
+        self.start = interned_dates.from_dict(start)
+        self.end = interned_dates.from_dict(end)
+
+
+class DictRelationship:
+    def __init__(self, id, from_component, to_component, relationship_type):
+        self.id = id
+        self.from_component = from_component
+        self.to_component = to_component
+        self._type = None
+        self.type = relationship_type
+
+    @property
+    def type(self):
+        return self._type
+
+    @type.setter
+    def type(self, value):
+        clean_value = value.upper().replace("-", "_")
+        self._type = clean_value if clean_value in Relationship.STANDARD_TYPES else value
+
+
+def build(n, ids, titles, event_class, period_class, relationship_class):
+    """Every fifth component a period and every tenth a relationship between the two preceding ones"""
+    components = []
+    for i in range(n):
+        importance = IMPORTANCE_LEVELS[i % 3]
+        year = 1000 + i % 1000
+        if i % 10 == 9:
+            components.append(relationship_class(ids[i], components[-2], components[-1], RELATIONSHIP_TYPES[i % 3]))
+        elif i % 5 == 4:
+            components.append(period_class(ids[i], titles[i], {'year': year}, {'year': year + 10}, importance))
+        else:
+            components.append(event_class(ids[i], titles[i], {'year': year, 'month': 1 + i % 12}, importance))
+    return components
+
+
+def described(component):
+    return component.type if hasattr(component, 'type') else component.importance
+
+
+def measure(n, ids, titles, *classes):
+    tracemalloc.start()
+    start = time.perf_counter()
+    components = build(n, ids, titles, *classes)
+    build_time = time.perf_counter() - start
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return build_time, memory, components
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    ids = [f"c{i}" for i in range(n)]
+    titles = [f"Component {i}" for i in range(n)]
+    build(n, ids, titles, Event, Period, Relationship)  # intern every date outside the measurements
+
+    before = measure(n, ids, titles, DictEvent, DictPeriod, DictRelationship)
+    after = measure(n, ids, titles, Event, Period, Relationship)
+    assert list(map(described, before[2])) == list(map(described, after[2])), "the layouts disagree"
+
+    print(f"{n} components")
+    for label, (build_time, memory, _) in (("__dict__", before), ("__slots__", after)):
+        print(f"{label:<10} {memory / n:7.1f} bytes/component   build {build_time * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Time the layout's date range, orderings and decimal-year conversions, per object and columnar.
+
+The per-object versions are the loops Timeline used before ComponentStore; both are
+checked to give the same results.
+
+Run from the repository root:
+    python -m benchmarks.bench_component_store [n_components]
+"""
+import sys
+import time
+from src.models import Event, Period, Timeline
+from src.models.component_store import ComponentStore
+
+IMPORTANCE_LEVELS = ["high", "medium", "low"]
+
+
+def build_components(n):
+    components = []
+    for i in range(n):
+        year = 1000 + i * 7 % 1000
+        importance = IMPORTANCE_LEVELS[i % 3]
+        if i % 5 == 4:
+            components.append(Period(f"p{i}", f"Period {i}", {'year': year}, {'year': year + 10}, importance))
+        else:
+            date = {'year': year, 'month': 1 + i % 12, 'day': 1 + i % 28} if i % 2 else {'year': year}
+            components.append(Event(f"e{i}", f"Event {i}", date, importance))
+    return components
+
+
+def per_object(timeline, components):
+    dates = []
+    for comp in components:
+        if isinstance(comp, Event):
+            dates.append(comp.date)
+        else:
+            dates.extend([comp.start, comp.end])
+    date_range = (min(dates), max(dates))
+    level_order = sorted(
+        components,
+        key=lambda x: (x.date.year if isinstance(x, Event) else x.start.year,
+                       x.date.month if isinstance(x, Event) and x.date.month else 0,
+                       x.date.day if isinstance(x, Event) and x.date.day else 0))
+    period_order = sorted((c for c in components if isinstance(c, Period)), key=lambda p: (p.start.year, p.end.year))
+    drawing_order = sorted(
+        components,
+        key=lambda x: (timeline._date_to_decimal(x.date if isinstance(x, Event) else x.start),
+                       -["HIGH", "MEDIUM", "LOW"].index(x.importance)))
+    positions = [timeline._date_to_decimal(c.date if isinstance(c, Event) else c.start) for c in components]
+    return date_range, level_order, period_order, drawing_order, positions
+
+
+def columnar(components):
+    store = ComponentStore(components)
+    return (store.date_range(), store.level_order(), store.period_order(), store.drawing_order(),
+            store.start_positions.tolist())
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    components = build_components(n)
+    timeline = Timeline("t", "T", components[:1])
+
+    loop_time, expected = timed(lambda: per_object(timeline, components))
+    store_time, result = timed(lambda: columnar(components))
+    build_time, store = timed(lambda: ComponentStore(components))
+    ops_time, _ = timed(lambda: (store.date_range(), store.level_order(), store.period_order(), store.drawing_order()))
+    assert result == expected, "ComponentStore disagrees with the per-object loops"
+
+    print(f"{n} components")
+    print(f"per-object loops     {loop_time * 1000:9.1f} ms")
+    print(f"ComponentStore       {store_time * 1000:9.1f} ms   (build {build_time * 1000:.1f} ms, "
+          f"range and orderings {ops_time * 1000:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Measure memory and allocations saved by interning dates.
+
+Builds events whose dates repeat the way they do in benchmarks.synthetic, then
+generates daily ticks over ten years several times, once with interning off
+(max_size 0) and once with it on.
+
+Run from the repository root:
+    python -m benchmarks.bench_date_interning [n_events]
+"""
+import sys
+import time
+import tracemalloc
+from src.models import Event, Timeline
+from src.models.date import interned_dates
+
+
+def build_events(n):
+    return [Event(f"e{i}", f"Event {i}", {'year': 1000 + i % 1000, 'month': 1 + i % 12, 'day': 1 + i % 28})
+            for i in range(n)]
+
+
+def measure(max_size, n):
+    interned_dates.max_size = max_size
+    interned_dates.clear()
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    events = build_events(n)
+    build_time = time.perf_counter() - start
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    timeline = Timeline("t", "Ticks", events[:2])
+    first = interned_dates.get(1900, 1, 1)
+    last = interned_dates.get(1909, 12, 31)
+    misses = interned_dates.misses
+    start = time.perf_counter()
+    for _ in range(20):
+        timeline._generate_ticks(first, last, "days_dense")
+    tick_time = time.perf_counter() - start
+    return build_time, memory, tick_time, interned_dates.misses - misses
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    default_size = interned_dates.max_size
+    off = measure(0, n)
+    on = measure(default_size, n)
+    interned_dates.max_size = default_size
+
+    print(f"{n} events")
+    for label, (build_time, memory, tick_time, built) in (("interning off", off), ("interning on", on)):
+        print(f"{label:<14} build {build_time * 1000:8.1f} ms  {memory / n:6.1f} bytes/event   "
+              f"ticks {tick_time * 1000:8.1f} ms, {built} dates built")
+
+
+if __name__ == "__main__":
+    main()
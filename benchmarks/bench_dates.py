@@ -0,0 +1,44 @@
+"""Time building, sorting and comparing Date objects of mixed precision.
+
+Run from the repository root:
+    python -m benchmarks.bench_dates [n_dates]
+"""
+import random
+import sys
+import time
+from src.models import Date
+
+
+def random_parts(rng, n):
+    """n (year, month, day) triples; a third are years, a third months and a third days"""
+    parts = []
+    for i in range(n):
+        year = rng.randrange(-3000, 2100)
+        month = rng.randrange(1, 13) if i % 3 else None
+        day = rng.randrange(1, 29) if i % 3 == 2 else None
+        parts.append((year, month, day))
+    return parts
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:<24} {(time.perf_counter() - start) * 1000:9.1f} ms")
+    return result
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 300000
+    parts = random_parts(random.Random(0), n)
+    dicts = [{'year': year, 'month': month, 'day': day} for year, month, day in parts]
+
+    print(f"{n} dates")
+    dates = timed("Date(dict)", lambda: [Date(d) for d in dicts])
+    timed("Date.of(ints)", lambda: [Date.of(*p) for p in parts])
+    timed("sorted()", lambda: sorted(dates))
+    timed("min() and max()", lambda: (min(dates), max(dates)))
+    timed("pairwise <=", lambda: sum(a <= b for a, b in zip(dates, dates[1:])))
+
+
+if __name__ == "__main__":
+    main()
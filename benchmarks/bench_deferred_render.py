@@ -0,0 +1,73 @@
+"""Compare /visualize payloads with timelines rendered eagerly against deferred image handles.
+
+A script exporting n timelines is compiled with eager rendering, with deferred images
+(an ImageStore) and without rendering at all. The deferred images are then rendered
+through the store and must match the eagerly rendered ones.
+
+Run from the repository root:
+    python -m benchmarks.bench_deferred_render [n_timelines]
+"""
+import base64
+import contextlib
+import io
+import os
+import sys
+import time
+from src import pipeline
+from src.image_store import ImageStore
+
+os.environ.setdefault('MPLBACKEND', 'Agg')
+
+
+def generate_script(n_timelines, events_per_timeline=6):
+    lines = []
+    for t in range(n_timelines):
+        ids = []
+        for e in range(events_per_timeline):
+            event_id = f"e{t}_{e}"
+            ids.append(event_id)
+            lines.append(f'event {event_id} {{ title = "Event {t}.{e}"; date = {1900 + 10 * e + t} CE; }}')
+        lines.append(f'timeline t{t} {{ title = "Timeline {t}"; {", ".join(ids)}; }}')
+    exports = " ".join(f"export t{t};" for t in range(n_timelines))
+    lines.append(f"main {{ {exports} }}")
+    return "\n".join(lines)
+
+
+def timed(fn):
+    """Run fn with stdout silenced, returning (seconds, result)"""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    n_timelines = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    code = generate_script(n_timelines)
+    store = ImageStore()
+
+    # The first render pays for importing matplotlib; keep it out of the timings
+    timed(lambda: pipeline.compile_timeline(generate_script(1)))
+
+    eager, eager_payload = timed(lambda: pipeline.compile_timeline(code))
+    deferred, deferred_payload = timed(lambda: pipeline.compile_timeline(code, image_store=store))
+    lint, _ = timed(lambda: pipeline.compile_timeline(code, render=False))
+    assert eager_payload['success'] and deferred_payload['success']
+
+    first = deferred_payload['components'][0]
+    first_image, png = timed(lambda: store.png(first['image_handle']))
+    for eager_component, deferred_component in zip(eager_payload['components'], deferred_payload['components']):
+        assert eager_component['json'] == deferred_component['json']
+        png = store.png(deferred_component['image_handle'])
+        assert base64.b64encode(png).decode('utf-8') == eager_component['image'], eager_component['id']
+
+    print(f"{n_timelines} exported timelines")
+    print(f"eager rendering     {eager * 1000:9.1f} ms")
+    print(f"deferred images     {deferred * 1000:9.1f} ms   ({eager / deferred:.0f}x faster)")
+    print(f"no rendering        {lint * 1000:9.1f} ms")
+    print(f"first image request {first_image * 1000:9.1f} ms")
+    print("deferred images match the eagerly rendered ones")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Check that display-id allocation gives the same names as the old scan, and that it scales linearly.
+
+Run from the repository root:
+    python -m benchmarks.bench_display_ids [max_exports]
+"""
+import contextlib
+import io
+import random
+import sys
+import time
+from src.TimelineInterpreter import TimelineInterpreter
+from src.models import Event
+
+
+def scan_display_id(exported_ids, base_id):
+    """The original allocation: scan every exported id for base_id and its "(n)" suffixes"""
+    existing_count = 0
+    for exported_id in exported_ids:
+        if exported_id.startswith(base_id):
+            if exported_id == base_id:
+                existing_count = max(existing_count, 1)
+            elif exported_id.startswith(f"{base_id} (") and exported_id.endswith(")"):
+                try:
+                    existing_count = max(existing_count, int(exported_id[len(base_id) + 2:-1]) + 1)
+                except (ValueError, IndexError):
+                    pass
+    return base_id if existing_count == 0 else f"{base_id} ({existing_count})"
+
+
+def make_interpreter(ids):
+    interpreter = TimelineInterpreter(render=False)
+    for component_id in ids:
+        interpreter.register_component(Event(component_id, component_id, {"year": 2000}))
+    return interpreter
+
+
+def check(n_exports=3000, seed=0):
+    # Ids sharing prefixes ("e1", "e10", ...) exercise the prefix matching of the old scan
+    rng = random.Random(seed)
+    ids = [f"e{i}" for i in range(120)]
+    interpreter = make_interpreter(ids)
+    expected = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(n_exports):
+            base_id = rng.choice(ids)
+            expected.append(scan_display_id(expected, base_id))
+            interpreter.export_component(base_id)
+    actual = [component['id'] for component in interpreter.exported_components]
+    assert actual == expected, "display ids differ from the original allocation"
+    print(f"{n_exports} random exports: same display ids as the original scan")
+
+
+def bench(max_exports):
+    n_exports = max_exports // 8
+    while n_exports <= max_exports:
+        ids = [f"e{i}" for i in range(100)]
+        interpreter = make_interpreter(ids)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for i in range(n_exports):
+                interpreter.export_component(ids[i % len(ids)])
+        elapsed = time.perf_counter() - start
+        print(f"{n_exports:>8} exports {elapsed * 1000:9.1f} ms  {elapsed / n_exports * 1e6:6.2f} us/export")
+        n_exports *= 2
+
+
+def main():
+    max_exports = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    check()
+    bench(max_exports)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Report import time of the entry points and check that the plotting stack stays lazy.
+
+Each module is imported in a fresh interpreter under `python -X importtime`.
+Run from the repository root:
+    python -m benchmarks.bench_importtime [n_slowest]
+"""
+import os
+import subprocess
+import sys
+
+# Entry points that must import without matplotlib or numpy
+ENTRY_POINTS = ["src", "src.pipeline", "cli", "app"]
+PLOTTING_MODULES = ("matplotlib", "numpy")
+
+
+def import_times(module: str):
+    """Return [(name, self_us, cumulative_us), ...] for every module imported by module"""
+    env = dict(os.environ, TIMELINE_WARMUP='0')
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True, env=env, check=True)
+    times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times.append((name.strip(), int(self_us), int(cumulative_us)))
+    return times
+
+
+def main():
+    n_slowest = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    failed = []
+    for module in ENTRY_POINTS:
+        times = import_times(module)
+        total = next(cumulative for name, _, cumulative in times if name == module)
+        plotting = sorted({name.split(".")[0] for name, _, _ in times if name.split(".")[0] in PLOTTING_MODULES})
+        print(f"{module:<14} {total / 1000:8.1f} ms   {len(times)} modules"
+              + (f"   imports {', '.join(plotting)}" if plotting else ""))
+        for name, self_us, _ in sorted(times, key=lambda t: t[1], reverse=True)[:n_slowest]:
+            print(f"    {self_us / 1000:8.1f} ms  {name}")
+        if plotting:
+            failed.append(module)
+
+    if failed:
+        sys.exit(f"plotting stack imported eagerly by: {', '.join(failed)}")
+
+
+if __name__ == "__main__":
+    main()
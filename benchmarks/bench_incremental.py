@@ -0,0 +1,57 @@
+"""Measure the incremental front-end against a full parse after a one-line edit.
+
+Run from the repository root:
+    python -m benchmarks.bench_incremental [n_declarations]
+"""
+import contextlib
+import io
+import sys
+import time
+from antlr4 import InputStream, CommonTokenStream
+from src.TimelineLexer import TimelineLexer
+from src.TimelineParser import TimelineParser
+from src.TimelineInterpreter import TimelineInterpreter
+from src.incremental import IncrementalFrontend
+from benchmarks.synthetic import generate_script
+
+
+def full_run(code: str):
+    lexer = TimelineLexer(InputStream(code))
+    parser = TimelineParser(CommonTokenStream(lexer))
+    interpreter = TimelineInterpreter()
+    interpreter.visit(parser.program())
+    return interpreter
+
+
+def timed(fn, *args):
+    # The interpreter prints progress messages, keep them out of the report
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    code = generate_script(size, export=False)
+    # Change a single title in the middle of the script
+    edited = code.replace(f'"Event {size // 2 + 1}"', '"Edited event"', 1)
+    assert edited != code
+
+    frontend = IncrementalFrontend()
+    full, full_time = timed(full_run, edited)
+    _, cold_time = timed(frontend.run, code)
+    incremental, edit_time = timed(frontend.run, edited)
+    assert incremental is not None, "incremental front-end fell back to the full parse"
+    assert sorted(incremental.events) == sorted(full.events)
+    assert incremental.timelines['bigTimeline'].to_dict() == full.timelines['bigTimeline'].to_dict()
+
+    print(f"declarations:               {size}")
+    print(f"full parse + interpret:     {full_time * 1000:10.1f} ms")
+    print(f"incremental, cold cache:    {cold_time * 1000:10.1f} ms")
+    print(f"incremental, one-line edit: {edit_time * 1000:10.1f} ms")
+    print(f"cache: {frontend.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Compare plain LL parsing against two-stage SLL-then-LL parsing.
+
+Run from the repository root:
+    python -m benchmarks.bench_parse [n_declarations ...]
+"""
+import glob
+import sys
+import time
+from antlr4 import InputStream, CommonTokenStream
+from src.TimelineLexer import TimelineLexer
+from src.TimelineParser import TimelineParser
+from src.parsing import TimelineErrorListener, parse_program
+from benchmarks.synthetic import generate_script
+
+
+def time_parse(code: str, two_stage: bool, repeat: int = 3):
+    """Best-of-repeat wall time for lexing and parsing code, plus the collected errors"""
+    best = None
+    errors = None
+    for _ in range(repeat):
+        lexer = TimelineLexer(InputStream(code))
+        lexer.removeErrorListeners()
+        tokens = CommonTokenStream(lexer)
+        tokens.fill()  # keep lexing out of the measured parse time
+        parser = TimelineParser(tokens)
+        listener = TimelineErrorListener()
+        parser.removeErrorListeners()
+        parser.addErrorListener(listener)
+
+        start = time.perf_counter()
+        parse_program(parser, two_stage=two_stage)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+        errors = listener.errors
+    return best, errors
+
+
+def report(name: str, code: str, repeat: int = 3):
+    ll_time, ll_errors = time_parse(code, two_stage=False, repeat=repeat)
+    sll_time, sll_errors = time_parse(code, two_stage=True, repeat=repeat)
+    assert ll_errors == sll_errors, f"{name}: error reports differ between LL and two-stage parsing"
+    speedup = ll_time / sll_time if sll_time else float('inf')
+    print(f"{name:<55} {ll_time * 1000:>10.2f} {sll_time * 1000:>10.2f} {speedup:>8.2f}x")
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10000, 20000]
+    print(f"{'input':<55} {'LL (ms)':>10} {'2-stage':>10} {'speedup':>9}")
+
+    # Warm the shared DFA once so every row measures steady-state prediction
+    for path in sorted(glob.glob("input_examples/*.timeline")):
+        with open(path, encoding='utf-8') as f:
+            time_parse(f.read(), two_stage=False, repeat=1)
+
+    for path in sorted(glob.glob("input_examples/*.timeline")):
+        with open(path, encoding='utf-8') as f:
+            report(path, f.read(), repeat=5)
+
+    for size in sizes:
+        report(f"synthetic ({size} declarations)", generate_script(size), repeat=3)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Check and time render deduplication by timeline fingerprint.
+
+The script exports one timeline several times, modifying it in between and then
+restoring it, so some exports repeat earlier states. The payload must be the same as
+when every export is drawn (fingerprints made unique), and a second run sharing a
+RenderCache must not draw anything.
+
+Run from the repository root:
+    python -m benchmarks.bench_render_dedup
+"""
+import contextlib
+import io
+import itertools
+import os
+import time
+from unittest import mock
+from src import pipeline
+from src.models import Timeline
+from src.render_cache import RenderCache
+
+os.environ.setdefault('MPLBACKEND', 'Agg')
+
+SCRIPT = """
+event a { title = "A"; date = 1900 CE; importance = high; }
+event b { title = "B"; date = 03-1950 CE; }
+period p { title = "P"; start = 1890 CE; end = 1960 CE; importance = low; }
+relationship r { from = p; to = b; type = includes; }
+timeline t { title = "T"; a, b, p, r; }
+main {
+    export t;
+    export t;
+    modify a { title = "Changed"; }
+    export t;
+    modify a { title = "A"; }
+    export t;
+    modify b { importance = high; }
+    export t;
+    modify b { importance = medium; }
+    export t;
+}
+"""
+
+
+def timed(fn):
+    """Run fn with stdout silenced, returning (seconds, result)"""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    # The first render pays for importing matplotlib; keep it out of the timings
+    timed(lambda: pipeline.compile_timeline('event a { title = "A"; date = 1 CE; } timeline t { title = "T"; a; } main { export t; }'))
+
+    counter = itertools.count()
+    with mock.patch.object(Timeline, 'fingerprint', lambda self: str(next(counter))):
+        every, every_payload = timed(lambda: pipeline.compile_timeline(SCRIPT))
+
+    with mock.patch.object(Timeline, 'generate_png_bytes', side_effect=Timeline.generate_png_bytes, autospec=True) as draw:
+        deduplicated, payload = timed(lambda: pipeline.compile_timeline(SCRIPT))
+        draws = draw.call_count
+        render_cache = RenderCache()
+        timed(lambda: pipeline.compile_timeline(SCRIPT, render_cache=render_cache))
+        draw.reset_mock()
+        cached, cached_payload = timed(lambda: pipeline.compile_timeline(SCRIPT, render_cache=render_cache))
+        cached_draws = draw.call_count
+
+    assert payload == every_payload, "deduplicated payload differs from drawing every export"
+    assert cached_payload == every_payload, "render cache payload differs from drawing every export"
+    assert cached_draws == 0, f"{cached_draws} timelines were drawn despite the render cache"
+
+    exports = len(payload['components'])
+    print(f"{exports} exports, {draws} distinct timeline states")
+    print(f"draw every export   {every * 1000:9.1f} ms")
+    print(f"deduplicated        {deduplicated * 1000:9.1f} ms")
+    print(f"render cache hit    {cached * 1000:9.1f} ms")
+    print("deduplicated payloads match drawing every export")
+
+
+if __name__ == "__main__":
+    main()
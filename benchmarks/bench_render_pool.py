@@ -0,0 +1,55 @@
+"""Compare rendering exported timelines on the calling thread against a pre-warmed RenderPool.
+
+The pooled payload must be identical to the serial one: same components, in export
+order, with byte-identical images.
+
+Run from the repository root:
+    python -m benchmarks.bench_render_pool [n_timelines] [workers]
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+from src import pipeline
+from src.render_pool import RenderPool
+from benchmarks.bench_deferred_render import generate_script
+
+os.environ.setdefault('MPLBACKEND', 'Agg')
+
+
+def timed(fn):
+    """Run fn with stdout silenced, returning (seconds, result)"""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    n_timelines = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else min(n_timelines, os.cpu_count() or 1)
+    code = generate_script(n_timelines)
+
+    # The first render pays for importing matplotlib; keep it out of the timings
+    timed(lambda: pipeline.compile_timeline(generate_script(1)))
+    single, _ = timed(lambda: pipeline.compile_timeline(generate_script(1)))
+    serial, serial_payload = timed(lambda: pipeline.compile_timeline(code))
+
+    pool = RenderPool(workers)
+    try:
+        warm_up = pool.warm()
+        pooled, pooled_payload = timed(lambda: pipeline.compile_timeline(code, render_pool=pool))
+    finally:
+        pool.shutdown()
+    assert pooled_payload == serial_payload, "pooled rendering changed the payload"
+
+    print(f"{n_timelines} exported timelines, {workers} workers ({os.cpu_count()} CPUs)")
+    print(f"one timeline        {single * 1000:9.1f} ms")
+    print(f"serial rendering    {serial * 1000:9.1f} ms")
+    print(f"render pool         {pooled * 1000:9.1f} ms   ({serial / pooled:.1f}x faster, warm-up {warm_up * 1000:.0f} ms)")
+    print("pooled payload matches the serial one")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Check and time incremental re-validation of timelines after a modify.
+
+A timeline of chained cause-effect events is modified once per component, and at the
+end one event is moved so that a relationship breaks. Re-checking only the stale
+relationships must report the same error as running validate_components() on every
+modify of the timeline, which is what the baseline does.
+
+Run from the repository root:
+    python -m benchmarks.bench_revalidation [n_events]
+"""
+import contextlib
+import io
+import sys
+import time
+from unittest import mock
+from src import pipeline
+from src.reference_index import ReferenceIndex
+
+
+def generate_script(n_events: int) -> str:
+    lines = [f'event e{i} {{ title = "Event {i}"; date = {1000 + i} CE; }}' for i in range(n_events)]
+    lines += [f'relationship r{i} {{ from = e{i}; to = e{i + 1}; type = cause-effect; }}' for i in range(n_events - 1)]
+    components = [f"e{i}" for i in range(n_events)] + [f"r{i}" for i in range(n_events - 1)]
+    lines.append(f'timeline t {{ title = "T"; {", ".join(components)}; }}')
+    lines.append(
+        "main {\n"
+        "    for x in t {\n"
+        "        modify x { importance = high; }\n"
+        "        modify t { title = \"T\"; }\n"
+        "    }\n"
+        f"    modify e{n_events // 2} {{ date = {1000 + n_events} CE; }}\n"
+        "    modify t { title = \"T\"; }\n"
+        "}\n"
+    )
+    return "\n".join(lines)
+
+
+def timed(fn):
+    """Run fn with stdout silenced, returning (seconds, result)"""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    n_events = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    code = generate_script(n_events)
+    timed(lambda: pipeline.compile_timeline(generate_script(10), render=False))  # warm the ANTLR caches
+
+    with mock.patch.object(ReferenceIndex, 'revalidate', lambda self, timeline: timeline.validate_components()):
+        full, full_payload = timed(lambda: pipeline.compile_timeline(code, render=False))
+    incremental, payload = timed(lambda: pipeline.compile_timeline(code, render=False))
+
+    assert payload == full_payload, "incremental re-validation reports differently from validate_components()"
+    assert not payload['success'], "the final modify should break a relationship"
+    errors = payload[payload['error_type'] + 's']
+
+    print(f"{n_events} events, {n_events - 1} relationships, {2 * n_events} modifies of the timeline")
+    print(f"validate_components  {full * 1000:9.1f} ms")
+    print(f"incremental          {incremental * 1000:9.1f} ms")
+    print(f"both report: {errors[0]['message']}")
+
+
+if __name__ == "__main__":
+    main()
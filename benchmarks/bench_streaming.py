@@ -0,0 +1,54 @@
+"""Compare peak memory of the full parse against the streaming front-end.
+
+Run from the repository root:
+    python -m benchmarks.bench_streaming [n_declarations]
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from src import pipeline
+from benchmarks.synthetic import generate_script
+
+
+def measure(fn):
+    """Run fn with stdout silenced, returning (seconds, peak traced bytes)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        payload = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert payload['error_type'] == 'export_missing', payload
+    return elapsed, peak
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    with tempfile.NamedTemporaryFile('w', suffix='.timeline', delete=False, encoding='utf-8') as f:
+        f.write(generate_script(size, export=False))
+        path = f.name
+
+    def full():
+        with open(path, encoding='utf-8') as script:
+            return pipeline.compile_timeline(script.read())
+
+    def streaming():
+        with open(path, encoding='utf-8') as script:
+            return pipeline.stream_timeline(script)
+
+    try:
+        print(f"declarations: {size} ({os.path.getsize(path) / 1e6:.1f} MB)")
+        for name, fn in (("full parse", full), ("streaming", streaming)):
+            elapsed, peak = measure(fn)
+            print(f"{name:<12} {elapsed:8.2f} s   peak {peak / 1e6:8.1f} MB")
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
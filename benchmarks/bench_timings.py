@@ -0,0 +1,50 @@
+"""Measure the cost of per-phase timing, off and on, when compiling a large script.
+
+Run from the repository root:
+    python -m benchmarks.bench_timings [n_declarations] [repeats]
+"""
+import contextlib
+import io
+import sys
+import time
+from src import pipeline, timings
+from benchmarks.synthetic import generate_script
+
+
+def best_of(repeats, fn):
+    """Fastest of repeats runs of fn with stdout silenced, in seconds"""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    code = generate_script(size, export=False)
+
+    def compile_with(enabled):
+        with timings.recording(enabled):
+            pipeline.compile_timeline(code, render=False)
+
+    compile_with(False)  # warm the ANTLR caches
+    off = best_of(repeats, lambda: compile_with(False))
+    on = best_of(repeats, lambda: compile_with(True))
+
+    with timings.recording() as recorded:
+        with contextlib.redirect_stdout(io.StringIO()):
+            pipeline.compile_timeline(code, render=False)
+    summary = recorded.to_dict()
+
+    print(f"declarations: {size}")
+    print(f"timing off {off * 1000:9.1f} ms")
+    print(f"timing on  {on * 1000:9.1f} ms   ({(on / off - 1) * 100:+.1f}%)")
+    print(f"phases: {summary['phases_ms']} (sum {sum(summary['phases_ms'].values()):.1f} of {summary['total_ms']:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
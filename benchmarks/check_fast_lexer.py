@@ -0,0 +1,103 @@
+"""Differential check and timing of TimelineFastLexer against the ANTLR TimelineLexer.
+
+Compares the full token stream (type, text, channel, offsets, line, column) and the
+reported lexer errors on every input_examples script and on fuzzed variants of them,
+then times both lexers on a large synthetic script.
+
+Run from the repository root:
+    python -m benchmarks.check_fast_lexer [n_fuzz_cases] [seed]
+"""
+import glob
+import random
+import sys
+import time
+from antlr4 import InputStream, CommonTokenStream
+from src.TimelineLexer import TimelineLexer
+from src.fast_lexer import TimelineFastLexer
+from src.parsing import TimelineErrorListener
+from benchmarks.synthetic import generate_script
+
+# Characters that stress every lexer rule, including the error paths
+FUZZ_ALPHABET = list('abcdefxyzBCE0123456789 \t\r\n"\\/!=<>-+.,;(){}@#$%_') + [
+    'event', 'cause-effect', 'cause-', '//', '"', '!=', '<=', 'CE', 'BCE', 'é'
+]
+
+
+def token_stream(lexer_class, code: str):
+    lexer = lexer_class(InputStream(code))
+    listener = TimelineErrorListener()
+    lexer.removeErrorListeners()
+    lexer.addErrorListener(listener)
+    tokens = CommonTokenStream(lexer)
+    tokens.fill()
+    stream = [(t.type, t.text, t.channel, t.start, t.stop, t.line, t.column, t.tokenIndex) for t in tokens.tokens]
+    return stream, listener.errors
+
+
+def compare(name: str, code: str) -> bool:
+    expected = token_stream(TimelineLexer, code)
+    actual = token_stream(TimelineFastLexer, code)
+    if expected == actual:
+        return True
+    print(f"MISMATCH in {name}: {code!r}")
+    for want, got in zip(expected[0], actual[0]):
+        if want != got:
+            print(f"  first differing token: expected {want}, got {got}")
+            break
+    if expected[1] != actual[1]:
+        print(f"  errors: expected {expected[1]}, got {actual[1]}")
+    return False
+
+
+def fuzz(code: str, rng: random.Random) -> str:
+    chars = list(code)
+    for _ in range(rng.randint(1, 8)):
+        pos = rng.randint(0, len(chars))
+        action = rng.random()
+        if action < 0.4:
+            chars.insert(pos, rng.choice(FUZZ_ALPHABET))
+        elif action < 0.7 and pos < len(chars):
+            del chars[pos]
+        elif pos < len(chars):
+            chars[pos] = rng.choice(FUZZ_ALPHABET)
+    return ''.join(chars)
+
+
+def time_lexer(lexer_class, code: str) -> float:
+    start = time.perf_counter()
+    lexer = lexer_class(InputStream(code))
+    lexer.removeErrorListeners()
+    CommonTokenStream(lexer).fill()
+    return time.perf_counter() - start
+
+
+def main():
+    n_fuzz = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    rng = random.Random(int(sys.argv[2]) if len(sys.argv) > 2 else 0)
+
+    examples = {}
+    for path in sorted(glob.glob("input_examples/*.timeline")):
+        with open(path, encoding='utf-8') as f:
+            examples[path] = f.read()
+
+    failures = sum(not compare(path, code) for path, code in examples.items())
+    sources = list(examples.values())
+    for i in range(n_fuzz):
+        if i % 4 == 0:
+            code = ''.join(rng.choice(FUZZ_ALPHABET) for _ in range(rng.randint(0, 60)))
+        else:
+            code = fuzz(rng.choice(sources), rng)
+        failures += not compare(f"fuzz case {i}", code)
+
+    print(f"{len(examples)} examples and {n_fuzz} fuzzed inputs compared, {failures} mismatches")
+
+    code = generate_script(5000)
+    antlr_time = time_lexer(TimelineLexer, code)
+    fast_time = time_lexer(TimelineFastLexer, code)
+    print(f"lexing 5000 declarations: ANTLR {antlr_time * 1000:.1f} ms, fast {fast_time * 1000:.1f} ms "
+          f"({antlr_time / fast_time:.1f}x)")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
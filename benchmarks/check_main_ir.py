@@ -0,0 +1,167 @@
+"""Check that the compiled main-block IR behaves exactly like walking the parse tree, and time both.
+
+Random main blocks over a small set of declarations are run with compile_main on and
+off; the outcome (error, exported components and every model's final state) must match.
+The compiled runs go through the optimizer, so folded conditions and removed code are
+checked too. The timing part loops over a timeline of 50k events whose declarations are
+built directly, so only the main block is parsed, with a condition the optimizer folds.
+
+Run from the repository root:
+    python -m benchmarks.check_main_ir [n_fuzz] [seed] [n_events]
+"""
+import contextlib
+import io
+import random
+import sys
+import time
+from antlr4 import InputStream, CommonTokenStream
+from src.TimelineLexer import TimelineLexer
+from src.TimelineParser import TimelineParser
+from src.TimelineInterpreter import TimelineInterpreter
+from src.models import Event, Timeline
+
+DECLARATIONS = """
+event e0 { title = "E0"; date = 1900 CE; importance = high; }
+event e1 { title = "E1"; date = 03-1950 CE; }
+event e2 { title = "E2"; date = 12-06-2001 CE; importance = low; }
+period p0 { title = "P0"; start = 1800 CE; end = 2000 CE; }
+relationship r0 { from = e0; to = e1; type = "related"; }
+timeline t0 { title = "T0"; e0, e1, p0, r0; }
+timeline t1 { title = "T1"; e2; }
+"""
+
+NAMES = ["e0", "e1", "e2", "p0", "r0", "t0", "t1", "zz"]
+COLLECTIONS = ["t0", "t1", "e0", "p0", "zz"]
+LOOP_VARS = ["x", "y"]
+PROPERTIES = ["title", "date", "start", "end", "importance", "type", "year"]
+OPERATORS = ["==", "!=", "<", ">", "<=", ">="]
+
+
+def random_expr(rng, names):
+    choice = rng.randrange(8)
+    if choice == 0:
+        return rng.choice(names)
+    if choice == 1:
+        return f'"{rng.choice(["E0", "Key", "x"])}"'
+    if choice == 2:
+        return str(rng.choice([1900, 1950, 2001, 5]))
+    if choice == 3:
+        return rng.choice(["1950 CE", "03-1950 CE", "12-06-2001 CE", "100 BCE"])
+    if choice == 4:
+        return rng.choice(["high", "medium", "low"])
+    if choice == 5:
+        return f"{rng.choice(names)}.year + 5"
+    return f"{rng.choice(names)}.{rng.choice(PROPERTIES)}"
+
+
+def random_condition(rng, names):
+    choice = rng.randrange(4)
+    if choice == 0:
+        return rng.choice(names)
+    if choice == 1:
+        return rng.choice(["true", "false"])
+    return f"{random_expr(rng, names)} {rng.choice(OPERATORS)} {random_expr(rng, names)}"
+
+
+def random_statements(rng, names, depth):
+    statements = []
+    for _ in range(rng.randrange(4)):
+        choice = rng.randrange(6 if depth < 3 else 3)
+        if choice == 0:
+            statements.append(f"export {rng.choice(names)};")
+        elif choice == 1:
+            assignments = " ".join(f"{rng.choice(PROPERTIES)} = {random_expr(rng, names)};"
+                                   for _ in range(rng.randrange(1, 3)))
+            statements.append(f"modify {rng.choice(names)} {{ {assignments} }}")
+        elif choice == 2:
+            statements.append(";")
+        elif choice in (3, 4):
+            then_block = random_statements(rng, names, depth + 1)
+            text = f"if ({random_condition(rng, names)}) {{ {then_block} }}"
+            if rng.random() < 0.5:
+                text += f" else {{ {random_statements(rng, names, depth + 1)} }}"
+            statements.append(text)
+        else:
+            var = rng.choice(LOOP_VARS)
+            body = random_statements(rng, names + [var], depth + 1)
+            statements.append(f"for {var} in {rng.choice(COLLECTIONS)} {{ {body} }}")
+    return " ".join(statements)
+
+
+def parse(code, rule="program"):
+    lexer = TimelineLexer(InputStream(code))
+    lexer.removeErrorListeners()
+    parser = TimelineParser(CommonTokenStream(lexer))
+    parser.removeErrorListeners()
+    tree = getattr(parser, rule)()
+    assert parser.getNumberOfSyntaxErrors() == 0, code
+    return tree
+
+
+def outcome(tree, compile_main):
+    """Interpret tree, returning everything observable about the run"""
+    interpreter = TimelineInterpreter(render=False, compile_main=compile_main)
+    error = None
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            interpreter.visit(tree)
+        except Exception as e:
+            error = (type(e).__name__, str(e))
+    tables = interpreter.symbol_tables()
+    models = {name: {key: model.to_dict() for key, model in table.items()} for name, table in tables.items()}
+    return error, interpreter.interpretation_errors, interpreter.exported_components, models
+
+
+def check(n_fuzz, seed):
+    rng = random.Random(seed)
+    mismatches = 0
+    for i in range(n_fuzz):
+        code = DECLARATIONS + f"main {{ {random_statements(rng, NAMES, 0)} }}"
+        tree = parse(code)
+        if outcome(tree, False) != outcome(tree, True):
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"mismatch on case {i}:\n{code}")
+    print(f"fuzzed main blocks: {n_fuzz}, mismatches: {mismatches}")
+    return mismatches
+
+
+def bench(n_events):
+    main_code = """main {
+        for c in big {
+            if (c.importance == high) { modify c { title = "Key"; } } else { ; }
+            if (c.date >= 1500) { modify c { importance = low; } }
+            if (c.title == "Key") { ; }
+            if (e0.date < 500) { modify c { title = "Ancient"; } }
+        }
+        export big;
+    }"""
+    main_block = parse(main_code, "mainBlock")
+    runs = [("tree walk", False, False), ("compiled IR", True, False), ("optimized IR", True, True)]
+    for name, compile_main, optimize_main in runs:
+        interpreter = TimelineInterpreter(render=False, compile_main=compile_main, optimize_main=optimize_main)
+        events = [Event(f"e{i}", f"Event {i}", {"year": 1000 + i % 1000}, ["HIGH", "MEDIUM", "LOW"][i % 3])
+                  for i in range(n_events)]
+        for event in events:
+            interpreter.register_component(event)
+        interpreter.timelines["big"] = Timeline("big", "Big", events)
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            interpreter.visit(main_block)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<13} {n_events} events  {elapsed * 1000:8.1f} ms")
+
+
+def main():
+    n_fuzz = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    n_events = int(sys.argv[3]) if len(sys.argv) > 3 else 50000
+    mismatches = check(n_fuzz, seed)
+    bench(n_events)
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
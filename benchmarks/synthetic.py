@@ -0,0 +1,75 @@
+"""Generators for large synthetic timeline scripts used by the benchmarks."""
+
+IMPORTANCE_LEVELS = ["high", "medium", "low"]
+
+
+def generate_script(n_declarations: int = 10000, export: bool = True) -> str:
+    """Build a valid script with roughly n_declarations declarations.
+
+    Every fifth declaration is a period, every tenth a relationship between the two
+    preceding events, and the whole set ends with a timeline holding the first
+    hundred components followed by a main block that loops, branches and modifies.
+    """
+    lines = []
+    event_ids = []
+    component_ids = []
+    for i in range(n_declarations):
+        year = 1000 + i % 1000
+        importance = IMPORTANCE_LEVELS[i % 3]
+        if i % 10 == 9 and len(event_ids) >= 2:
+            rel_id = f"r{i}"
+            lines.append(
+                f"relationship {rel_id} {{\n"
+                f"    from = {event_ids[-2]};\n"
+                f"    to = {event_ids[-1]};\n"
+                f"    type = \"related\";\n"
+                f"}}\n"
+            )
+            component_ids.append(rel_id)
+        elif i % 5 == 4:
+            period_id = f"p{i}"
+            lines.append(
+                f"period {period_id} {{\n"
+                f"    title = \"Period {i}\";\n"
+                f"    start = {year} CE;\n"
+                f"    end = {year + 10} CE;\n"
+                f"    importance = {importance};\n"
+                f"}}\n"
+            )
+            component_ids.append(period_id)
+        else:
+            event_id = f"e{i}"
+            day = 1 + i % 28
+            month = 1 + i % 12
+            lines.append(
+                f"event {event_id} {{\n"
+                f"    title = \"Event {i}\";\n"
+                f"    date = {day:02d}-{month:02d}-{year} CE;\n"
+                f"    importance = {importance};\n"
+                f"}}\n"
+            )
+            event_ids.append(event_id)
+            component_ids.append(event_id)
+
+    # Relationships must reference components that are in the same timeline
+    timeline_components = [c for c in component_ids[:100] if not c.startswith("r")]
+    lines.append(
+        "timeline bigTimeline {\n"
+        "    title = \"Synthetic Timeline\";\n"
+        f"    {', '.join(timeline_components)};\n"
+        "}\n"
+    )
+
+    lines.append(
+        "main {\n"
+        "    for c in bigTimeline {\n"
+        "        if (c.importance == high) {\n"
+        "            modify c { title = \"Important\"; }\n"
+        "        } else {\n"
+        "            ;\n"
+        "        }\n"
+        "    }\n"
+        + ("    export bigTimeline;\n" if export else "")
+        + "}\n"
+    )
+    return "\n".join(lines)
@@ -0,0 +1,96 @@
+import argparse
+import base64
+import json
+import os
+import sys
+from src import compiled_cache, pipeline, timings
+from src.render_pool import RenderPool
+
+
+def write_components(components, output_dir):
+    """Write each exported component as JSON (and PNG for timelines) into output_dir"""
+    os.makedirs(output_dir, exist_ok=True)
+    for component in components:
+        with open(os.path.join(output_dir, f"{component['id']}.json"), 'w') as f:
+            f.write(component['json'])
+        if component.get('image'):
+            with open(os.path.join(output_dir, f"{component['id']}.png"), 'wb') as f:
+                f.write(base64.b64decode(component['image']))
+        print(f"[Info] Wrote {component['type']} {component['id']} to {output_dir}")
+
+
+def print_errors(payload):
+    print(payload['error'], file=sys.stderr)
+    for key, errors in payload.items():
+        if not key.endswith('_errors'):
+            continue
+        for error in errors:
+            location = f"line {error['line']}, column {error['column']}: " if error.get('line') is not None else ""
+            print(f"  {location}{error['message']}", file=sys.stderr)
+
+
+def compile_script(args, max_errors, render_pool):
+    """Compile args.script with the front-end the arguments select, returning the payload"""
+    if args.stream or args.no_cache:
+        with open(args.script, encoding='utf-8') as f:
+            if args.stream:
+                return pipeline.stream_timeline(f, lexer_kind=args.lexer, max_errors=max_errors,
+                                                render_pool=render_pool)
+            return pipeline.compile_timeline(f.read(), lexer_kind=args.lexer, two_stage=args.two_stage,
+                                             max_errors=max_errors, render_pool=render_pool, debug=args.explain)
+    return pipeline.compile_file(args.script, lexer_kind=args.lexer, two_stage=args.two_stage,
+                                 run_main=not args.compile_only, max_errors=max_errors, render_pool=render_pool,
+                                 debug=args.explain)
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Compile a .timeline script and write its exported components.")
+    arg_parser.add_argument('script', help="path to the .timeline file")
+    arg_parser.add_argument('-o', '--output', default='output', help="directory for exported files (default: output)")
+    arg_parser.add_argument('--lexer', choices=['antlr', 'fast'], default='antlr', help="lexer implementation")
+    arg_parser.add_argument('--two-stage', action='store_true', help="parse in SLL mode first, falling back to LL")
+    arg_parser.add_argument('--stream', action='store_true',
+                            help="parse and interpret one declaration at a time (for very large files)")
+    arg_parser.add_argument('--no-cache', action='store_true',
+                            help="ignore and do not write the compiled cache (<script>c) next to the script")
+    arg_parser.add_argument('--compile-only', action='store_true',
+                            help="only bring the compiled cache up to date, without running the main block")
+    arg_parser.add_argument('--max-errors', type=int, default=None, metavar='N',
+                            help="stop lexing and parsing after N errors")
+    arg_parser.add_argument('--first-error', action='store_true',
+                            help="stop at the first lexer or parser error (same as --max-errors 1)")
+    arg_parser.add_argument('--explain', action='store_true',
+                            help="list the statements the optimizer removed from the main block")
+    arg_parser.add_argument('--timings', action='store_true',
+                            help="print the time spent in each phase (lexer, parser, interpreter, drawing, ...)")
+    arg_parser.add_argument('-j', '--jobs', type=int, default=1, metavar='N',
+                            help="render exported timelines in N worker processes (default: 1, in-process)")
+    args = arg_parser.parse_args(argv)
+    max_errors = 1 if args.first_error else args.max_errors
+    render_pool = RenderPool(args.jobs) if args.jobs > 1 and not args.compile_only else None
+    try:
+        with timings.recording(args.timings) as run_timings:
+            payload = compile_script(args, max_errors, render_pool)
+    finally:
+        if render_pool is not None:
+            render_pool.shutdown()
+    if run_timings is not None:
+        print(f"[Info] timings {json.dumps(run_timings.to_dict())}")
+
+    if not payload['success']:
+        print_errors(payload)
+        return 1
+
+    if args.compile_only:
+        print(f"[Info] Compiled {args.script} to {compiled_cache.cache_path(args.script)}")
+        return 0
+
+    for removed in payload.get('optimizer', {}).get('removed', []):
+        print(f"[Info] Optimizer removed line {removed['line']}, column {removed['column']}: "
+              f"{removed['statement']} ({removed['reason']})")
+    write_components(payload['components'], args.output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
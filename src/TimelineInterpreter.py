@@ -1,7 +1,15 @@
 from src.TimelineParser import TimelineParser
 from src.TimelineParserVisitor import TimelineParserVisitor
 from src.models import Event, Period, Timeline, Relationship, Date
+from src.models.date import interned_dates
+from src.main_compiler import compile_main_block
+from src.main_optimizer import MainOptimizer
+from src.reference_index import ReferenceIndex
+from src.environment import Environment
+from src.symbol_table import SymbolTable, EVENT, PERIOD, RELATIONSHIP, TIMELINE
+from src.timings import phase
 import base64
+from concurrent.futures import Future
 
 
 def apply_comparison(left, right, op):
@@ -9,14 +17,14 @@ def apply_comparison(left, right, op):
         return False
 
     if isinstance(left, dict) and 'year' in left:
-        left = Date(left)
+        left = interned_dates.from_dict(left)
     if isinstance(right, dict) and 'year' in right:
-        right = Date(right)
+        right = interned_dates.from_dict(right)
 
     if isinstance(left, int) and isinstance(right, Date):
-        left = Date({"year": left})
+        left = interned_dates.get(left)
     if isinstance(right, int) and isinstance(left, Date):
-        right = Date({"year": right})
+        right = interned_dates.get(right)
 
     ops = {
         "==": lambda a, b: a == b,
@@ -34,6 +42,12 @@ def apply_comparison(left, right, op):
         return False
 
 
+# Kinds of symbol accepted by each kind of reference
+DATED_KINDS = (EVENT, PERIOD)  # relationship endpoints, single-item loops
+COMPONENT_KINDS = (EVENT, PERIOD, RELATIONSHIP)  # timeline members
+DECLARED_KINDS = (EVENT, PERIOD, TIMELINE)  # `if (id)` conditions
+
+
 class ValidationError(Exception):
     """Custom exception for validation errors"""
     def __init__(self, message, line=None, column=None):
@@ -43,14 +57,32 @@ class ValidationError(Exception):
 
 
 class TimelineInterpreter(TimelineParserVisitor):
-    def __init__(self):
-        self.events = {}
-        self.periods = {}
-        self.timelines = {}
-        self.relationships = {}
+    def __init__(self, render=True, compile_main=True, image_store=None, render_pool=None, render_cache=None,
+                 optimize_main=True):
+        self.render = render  # False records exports without generating JSON or PNGs (lint only)
+        self.image_store = image_store  # When set, timeline PNGs are deferred to the store instead of rendered here
+        self.render_pool = render_pool  # When set, timeline PNGs are rendered by its worker processes
+        self.render_cache = render_cache  # Optional RenderCache reusing PNGs across runs
+        self._renders = {}  # timeline fingerprint -> PNG bytes (a Future with a render pool) drawn in this run
+        self._pending_images = []  # (component data, future PNG, fingerprint, timeline id, ctx) of exports still rendering
+        self.compile_main = compile_main  # Run main through the closure IR instead of walking the tree
+        self.optimize_main = optimize_main  # Fold constant conditions and drop dead code while compiling main
+        self.optimizer_report = []  # What the optimizer removed from main, for the debug view
+        self._bind_symbols(SymbolTable())
+        self.environment = Environment()  # loop variables of the enclosing for loops
         self.exported_components = []  # Store rendered components immediately
+        self._display_id_counts = {}  # base id -> number of exports displayed under it
         self.interpretation_errors = []
 
+    def _bind_symbols(self, symbols):
+        # Every declared id maps to one (kind, component) entry; the per-kind dicts are views of it
+        self.symbols = symbols
+        self._references = None  # ReferenceIndex over symbols, built by the first modify
+        self.events = symbols.view(EVENT)
+        self.periods = symbols.view(PERIOD)
+        self.timelines = symbols.view(TIMELINE)
+        self.relationships = symbols.view(RELATIONSHIP)
+
     def add_error(self, error_msg, ctx=None, ExceptionType=Exception):
         line = None
         column = None
@@ -118,8 +150,7 @@ class TimelineInterpreter(TimelineParserVisitor):
         title = ctx.STRING().getText().strip('"')
         date_dict = self.visit(ctx.dateExpr())
 
-        if event_id in self.periods.keys() or event_id in self.relationships.keys() or event_id in self.timelines.keys():
-            self.add_error(f"Identifier '{event_id}' is already used", ctx, ExceptionType=NameError)
+        self._check_identifier_free(event_id, EVENT, ctx)
 
         if not date_dict:
             self.add_error(f"Invalid date format for event {event_id}", ctx, ExceptionType=ValidationError)
@@ -142,8 +173,7 @@ class TimelineInterpreter(TimelineParserVisitor):
         start_dict = self.visit(ctx.dateExpr(0))
         end_dict = self.visit(ctx.dateExpr(1))
 
-        if period_id in self.events.keys() or period_id in self.relationships.keys() or period_id in self.timelines.keys():
-            self.add_error(f"Identifier '{period_id}' is already used", ctx, ExceptionType=NameError)
+        self._check_identifier_free(period_id, PERIOD, ctx)
 
         if not start_dict or not end_dict:
             self.add_error(f"Invalid date format for period {period_id}", ctx, ExceptionType=ValidationError)
@@ -160,18 +190,50 @@ class TimelineInterpreter(TimelineParserVisitor):
             self.add_error(f"Error in period {period_id}: {str(e)}", ctx, ExceptionType=ValidationError)
             return None
 
+    def register_component(self, component, ctx=None):
+        """Register an already-built Event or Period as if its declaration had just been visited."""
+        if isinstance(component, Event):
+            self._check_identifier_free(component.id, EVENT, ctx)
+            self.events[component.id] = component
+        elif isinstance(component, Period):
+            self._check_identifier_free(component.id, PERIOD, ctx)
+            self.periods[component.id] = component
+        else:
+            raise TypeError(f"Cannot register component of type {type(component).__name__}")
+
+    def _check_identifier_free(self, identifier, kind, ctx=None):
+        """Reject an id already declared as another kind (redeclaring the same kind replaces it)."""
+        entry = self.symbols.lookup(identifier)
+        if entry is not None and entry[0] != kind:
+            self.add_error(f"Identifier '{identifier}' is already used", ctx, ExceptionType=NameError)
+
+    def symbol_tables(self) -> dict:
+        """Return the declared components as plain dicts keyed by table name, e.g. for caching them on disk."""
+        return {
+            'events': dict(self.events),
+            'periods': dict(self.periods),
+            'relationships': dict(self.relationships),
+            'timelines': dict(self.timelines)
+        }
+
+    def load_symbol_tables(self, tables: dict):
+        """Replace the declared components with tables previously returned by symbol_tables()."""
+        self._bind_symbols(SymbolTable())
+        for name, kind in (('events', EVENT), ('periods', PERIOD), ('relationships', RELATIONSHIP), ('timelines', TIMELINE)):
+            for identifier, component in tables[name].items():
+                self.symbols.declare(identifier, kind, component)
+
     def visitTimelineDecl(self, ctx: TimelineParser.TimelineDeclContext):
         timeline_id = ctx.ID().getText()
         title = ctx.STRING().getText().strip('"')
 
-        if timeline_id in self.events.keys() or timeline_id in self.relationships.keys() or timeline_id in self.periods.keys():
-            self.add_error(f"Identifier '{timeline_id}' is already used", ctx, ExceptionType=NameError)
+        self._check_identifier_free(timeline_id, TIMELINE, ctx)
 
         components = []
         comp_ctx = ctx.componentList()
         if comp_ctx: 
             for comp_id in [id.getText() for id in comp_ctx.ID()]:
-                component = self.events.get(comp_id) or self.periods.get(comp_id) or self.relationships.get(comp_id)
+                component = self.symbols.get(comp_id, COMPONENT_KINDS)
                 if component:
                     components.append(component)
                 else:
@@ -191,10 +253,9 @@ class TimelineInterpreter(TimelineParserVisitor):
         to_id = ctx.ID()[2].getText()
         rel_type = ctx.relationshipType().getText()
 
-        if rel_id in self.events.keys() or rel_id in self.timelines.keys() or rel_id in self.periods.keys():
-            self.add_error(f"Identifier '{rel_id}' is already used", ctx, ExceptionType=NameError)
-        from_comp = self.events.get(from_id) or self.periods.get(from_id)
-        to_comp = self.events.get(to_id) or self.periods.get(to_id)
+        self._check_identifier_free(rel_id, RELATIONSHIP, ctx)
+        from_comp = self.symbols.get(from_id, DATED_KINDS)
+        to_comp = self.symbols.get(to_id, DATED_KINDS)
         if not from_comp:
             self.add_error(f"Relationship 'from' component '{from_id}' does not exist", ctx, ExceptionType=ValidationError)
             return None
@@ -210,9 +271,30 @@ class TimelineInterpreter(TimelineParserVisitor):
             self.add_error(f"Error in relationship {rel_id}: {str(e)}", ctx, ExceptionType=ValidationError)
             return None
 
+    def visitMainBlock(self, ctx: TimelineParser.MainBlockContext):
+        try:
+            if not self.compile_main:
+                result = self.visitChildren(ctx)
+                self.finish_rendering()
+                return result
+            optimizer = MainOptimizer(self, ctx) if self.optimize_main else None
+            run = compile_main_block(self, ctx, optimizer)
+            if optimizer is not None:
+                self.optimizer_report = optimizer.removed
+            run()
+            self.finish_rendering()
+            return None
+        finally:
+            # Only left over when main raised before finish_rendering() collected them
+            self.cancel_rendering()
+
     def visitExportStmt(self, ctx: TimelineParser.ExportStmtContext):
         export_id = ctx.ID().getText()
-        
+        return self.export_component(export_id, ctx, self.environment.lookup(export_id))
+
+    def export_component(self, export_id, ctx=None, loop_value=None):
+        """Export a component; loop_value is what export_id is bound to as a loop variable, if anything."""
+
         if self.interpretation_errors:
             return None
 
@@ -222,8 +304,8 @@ class TimelineInterpreter(TimelineParserVisitor):
         actual_component_id = export_id  # Default to the export_id
         
         # Check loop variables first
-        if hasattr(self, '_loop_vars') and export_id in self._loop_vars:
-            component = self._loop_vars[export_id]
+        if loop_value is not None:
+            component = loop_value
             # Use the component's actual ID instead of the loop variable name
             actual_component_id = component.id if hasattr(component, 'id') else export_id
 
@@ -241,18 +323,9 @@ class TimelineInterpreter(TimelineParserVisitor):
 
         # Check global components if not found in loop variables
         if not component:
-            if export_id in self.timelines:
-                component = self.timelines[export_id]
-                component_type = 'timeline'
-            elif export_id in self.events:
-                component = self.events[export_id]
-                component_type = 'event'
-            elif export_id in self.periods:
-                component = self.periods[export_id]
-                component_type = 'period'
-            elif export_id in self.relationships:
-                component = self.relationships[export_id]
-                component_type = 'relationship'
+            entry = self.symbols.lookup(export_id)
+            if entry is not None:
+                component_type, component = entry
         
         if not component:
             self.add_error(f"ID '{export_id}' not found.", ctx, ExceptionType=LookupError)
@@ -260,26 +333,90 @@ class TimelineInterpreter(TimelineParserVisitor):
 
         display_id = self._generate_unique_display_id(actual_component_id)
 
+        if not self.render:
+            self._add_export({
+                'id': display_id,
+                'type': component_type,
+                'title': component.title if component_type != 'relationship' else f"Relationship {component.id}"
+            }, actual_component_id)
+            return None
+
         try:
-            component_data = self._render_component(component, component_type, display_id)
+            component_data = self._render_component(component, component_type, display_id, ctx)
             if component_data:
-                self.exported_components.append(component_data)
+                self._add_export(component_data, actual_component_id)
                 print(f"[Info] {component_type.capitalize()} {actual_component_id} exported and rendered as {display_id}")
         except Exception as e:
             self.add_error(f"Error rendering component '{actual_component_id}': {str(e)}", ctx, ExceptionType=RuntimeError)
             
         return None
 
-    def _render_component(self, component, component_type, component_id):
+    def finish_rendering(self):
+        """Wait for the timelines handed to the render pool and fill in their images, in export order"""
+        pending, self._pending_images = self._pending_images, []
+        for component_data, future, fingerprint, timeline_id, ctx in pending:
+            try:
+                with phase('render_wait'):
+                    png = future.result()
+            except Exception as e:
+                for _, other, _, _, _ in pending:
+                    other.cancel()
+                self.add_error(f"Error rendering component '{timeline_id}': {str(e)}", ctx, ExceptionType=RuntimeError)
+            if self.render_cache is not None:
+                self.render_cache.put(fingerprint, png)
+            with phase('base64'):
+                component_data['image'] = base64.b64encode(png).decode('utf-8')
+
+    def cancel_rendering(self):
+        """Cancel the renders still waiting in the render pool and drop their exports"""
+        pending, self._pending_images = self._pending_images, []
+        for _, future, _, _, _ in pending:
+            future.cancel()
+
+    def _render_png(self, timeline):
+        """Return (fingerprint, PNG bytes) for timeline, drawing each distinct fingerprint only once.
+
+        With a render pool the PNG is a Future instead of bytes.
+        """
+        fingerprint = timeline.fingerprint()
+        png = self._renders.get(fingerprint)
+        if png is None:
+            png = self.render_cache.get(fingerprint) if self.render_cache is not None else None
+            if self.render_pool is not None:
+                if png is None:
+                    png = self.render_pool.submit(timeline)
+                else:
+                    future = Future()
+                    future.set_result(png)
+                    png = future
+            elif png is None:
+                png = timeline.generate_png_bytes()
+                if self.render_cache is not None:
+                    self.render_cache.put(fingerprint, png)
+            self._renders[fingerprint] = png
+        return fingerprint, png
+
+    def _render_component(self, component, component_type, component_id, ctx=None):
         try:
             if component_type == 'timeline':
-                return {
+                component_data = {
                     'id': component_id,
                     'type': 'timeline',
                     'title': component.title,
-                    'json': component.generate_json(),
-                    'image': base64.b64encode(component.generate_png_bytes()).decode('utf-8')
+                    'json': component.generate_json()
                 }
+                if self.image_store is not None:
+                    # Only a snapshot is taken now; the PNG is rendered when the client asks for it
+                    component_data['image_handle'] = self.image_store.add(component)
+                elif self.render_pool is not None:
+                    # Rendered in parallel with the rest of main; finish_rendering() fills in the image
+                    fingerprint, future = self._render_png(component)
+                    self._pending_images.append((component_data, future, fingerprint, component.id, ctx))
+                else:
+                    _, png = self._render_png(component)
+                    with phase('base64'):
+                        component_data['image'] = base64.b64encode(png).decode('utf-8')
+                return component_data
             elif component_type == 'event':
                 return {
                     'id': component_id,
@@ -331,52 +468,32 @@ class TimelineInterpreter(TimelineParserVisitor):
             left = self.visitExpr(ctx.expr(0))
             right = self.visitExpr(ctx.expr(1))
             op = ctx.comparisonOp().getText()
-
-            # Handle date comparisons
-            if isinstance(left, dict) and 'year' in left:
-                left = Date(left)
-            if isinstance(right, dict) and 'year' in right:
-                right = Date(right)
-            try:
-                return apply_comparison(left, right, op)
-            except TypeError as e:
-                self.add_error(str(e), ctx, TypeError)
+            return self.compare(left, right, op, ctx)
 
         elif ctx.ID():
-            comp_id = ctx.ID().getText()
-            return comp_id in self.events or comp_id in self.periods or comp_id in self.timelines
+            return self.is_declared(ctx.ID().getText())
         elif ctx.booleanLiteral():
             return ctx.booleanLiteral().getText().lower() == "true"
         return False
 
+    def compare(self, left, right, op, ctx=None):
+        # Handle date comparisons
+        if isinstance(left, dict) and 'year' in left:
+            left = interned_dates.from_dict(left)
+        if isinstance(right, dict) and 'year' in right:
+            right = interned_dates.from_dict(right)
+        try:
+            return apply_comparison(left, right, op)
+        except TypeError as e:
+            self.add_error(str(e), ctx, TypeError)
+
+    def is_declared(self, comp_id):
+        return self.symbols.lookup(comp_id, DECLARED_KINDS) is not None
+
     def visitExpr(self, ctx: TimelineParser.ExprContext):
         if ctx.ID() and ctx.property_():
             obj_id = ctx.ID().getText()
-            prop = ctx.property_().getText().lower()
-
-            component = (self.events.get(obj_id) or 
-                       self.periods.get(obj_id) or 
-                       self.relationships.get(obj_id) or 
-                       self.timelines.get(obj_id))
-
-            # Check if the component exists and handle loop variables
-            if not component and hasattr(self, '_loop_vars') and obj_id in self._loop_vars:
-                component = self._loop_vars[obj_id]
-            elif not component:
-                self.add_error(f"Component '{obj_id}' not found", ctx, ExceptionType=LookupError)
-            
-            if component:
-                if hasattr(component, prop):
-                    value = getattr(component, prop)
-                    # If it's a Date object, convert to dict for consistency
-                    if isinstance(value, Date):
-                        return {"year": value.year, "month": value.month, "day": value.day}
-                    return value
-                elif isinstance(component, dict) and prop in component:
-                    return component[prop]
-                else:
-                    self.add_error(f"No {prop} property for {obj_id}", ctx, ExceptionType=AttributeError)
-            return None
+            return self.get_property(obj_id, ctx.property_().getText().lower(), ctx, self.environment.lookup(obj_id))
         elif ctx.STRING():
             return ctx.STRING().getText().strip('"')
         elif ctx.INT():
@@ -386,70 +503,95 @@ class TimelineInterpreter(TimelineParserVisitor):
         elif ctx.importanceValue():
             return ctx.importanceValue().getText().upper()
         elif ctx.ID():
-            # First check if it's a loop variable
-            if hasattr(self, '_loop_vars') and ctx.ID().getText() in self._loop_vars:
-                return self._loop_vars[ctx.ID().getText()]
-            return ctx.ID().getText()
+            # A loop variable evaluates to its item, any other name to itself
+            name = ctx.ID().getText()
+            return self.environment.lookup(name, name)
+        return None
+
+    def get_property(self, obj_id, prop, ctx=None, loop_value=None):
+        component = self.symbols.get(obj_id)
+
+        # Check if the component exists and handle loop variables
+        if not component and loop_value is not None:
+            component = loop_value
+        elif not component:
+            self.add_error(f"Component '{obj_id}' not found", ctx, ExceptionType=LookupError)
+        
+        if component:
+            if hasattr(component, prop):
+                value = getattr(component, prop)
+                # If it's a Date object, convert to dict for consistency
+                if isinstance(value, Date):
+                    return {"year": value.year, "month": value.month, "day": value.day}
+                return value
+            elif isinstance(component, dict) and prop in component:
+                return component[prop]
+            else:
+                self.add_error(f"No {prop} property for {obj_id}", ctx, ExceptionType=AttributeError)
         return None
 
     def visitForStmt(self, ctx: TimelineParser.ForStmtContext):
         # Get the iterator variable and collection
         iter_var = ctx.ID(0).getText()
-        collection_id = ctx.ID(1).getText()
-        
+        collection = self.loop_collection(ctx.ID(1).getText(), ctx)
+        if collection is None:
+            return None
+
+        statements = ctx.statement()
+        self.run_loop(iter_var, collection, lambda: [self.visit(stmt) for stmt in statements])
+        return None
+
+    def loop_collection(self, collection_id, ctx=None):
         # Find the collection to iterate over
         collection = None
-        if collection_id in self.timelines:
-            timeline = self.timelines[collection_id]
-            collection = timeline.components if hasattr(timeline, 'components') else []
-        elif collection_id in self.events:
-            collection = [self.events[collection_id]]
-        elif collection_id in self.periods:
-            collection = [self.periods[collection_id]]
+        kind, component = self.symbols.lookup(collection_id) or (None, None)
+        if kind == TIMELINE:
+            collection = component.components if hasattr(component, 'components') else []
+        elif kind in DATED_KINDS:
+            collection = [component]
         else:
             self.add_error(f"Cannot iterate over unknown collection '{collection_id}'", ctx, ExceptionType=LookupError)
             return None
-            
-        # Execute the for loop body for each item
-        for item in collection:
-            # Store the current item in a way accessible to other visitors
-            if not hasattr(self, '_loop_vars'):
-                self._loop_vars = {}
-            self._loop_vars[iter_var] = item
-            
-            # Execute all statements in the loop body
-            for stmt in ctx.statement():
-                self.visit(stmt)
-                
-        # Clean up the loop variable
-        if hasattr(self, '_loop_vars') and iter_var in self._loop_vars:
-            del self._loop_vars[iter_var]
-            
+        return collection
+
+    def run_loop(self, iter_var, collection, body):
+        # The loop variable gets its own frame, so an inner loop reusing the name only shadows it
+        environment = self.environment
+        slot = environment.push(iter_var)
+        try:
+            # Execute the for loop body for each item
+            for item in collection:
+                environment.values[slot] = item
+                body()
+        finally:
+            environment.pop()
         return None
 
     def visitModifyStmt(self, ctx: TimelineParser.ModifyStmtContext):
-        # Get the component to modify
+        assignments = [
+            (assignment.property_().getText().lower(), lambda expr=assignment.expr(): self.visitExpr(expr))
+            for assignment in ctx.propertyAssignment()
+        ]
         component_id = ctx.ID().getText()
-        
+        return self.modify_component(component_id, assignments, ctx, self.environment.lookup(component_id))
+
+    def modify_component(self, component_id, assignments, ctx=None, loop_value=None):
+        """Apply (property, evaluate) assignments to a component; each value is evaluated just before it is set."""
         # First check if it's a loop variable
         component = None
-        if hasattr(self, '_loop_vars') and component_id in self._loop_vars:
-            component = self._loop_vars[component_id]
+        if loop_value is not None:
+            component = loop_value
         else:
             # If not a loop variable, check regular components
-            component = (self.events.get(component_id) or 
-                       self.periods.get(component_id) or 
-                       self.relationships.get(component_id) or 
-                       self.timelines.get(component_id))
+            component = self.symbols.get(component_id)
         
         if not component:
             self.add_error(f"Cannot modify unknown component '{component_id}'", ctx, ExceptionType=LookupError)
             return None
             
         # Process each property assignment
-        for assignment in ctx.propertyAssignment():
-            prop = assignment.property_().getText().lower()
-            value = self.visitExpr(assignment.expr())
+        for prop, evaluate in assignments:
+            value = evaluate()
             
             try:
                 if prop in ['date', 'start', 'end']:
@@ -459,14 +601,14 @@ class TimelineInterpreter(TimelineParserVisitor):
                     # Create a new Date object with the dictionary
                     if isinstance(component, Event):
                         if prop == 'date':
-                            component.date = Date(date_dict)
+                            component.date = interned_dates.from_dict(date_dict)
                         else:
                             self.add_error("No such property for component of type Event", ctx, ExceptionType=AttributeError)
                     if isinstance(component, Period):
                         if prop == 'start':
-                            component.start = Date(date_dict)
+                            component.start = interned_dates.from_dict(date_dict)
                         elif prop == 'end':
-                            component.end = Date(date_dict)
+                            component.end = interned_dates.from_dict(date_dict)
                         else:
                             self.add_error("No such property for component of type Period", ctx, ExceptionType=AttributeError)
                 else:
@@ -477,6 +619,7 @@ class TimelineInterpreter(TimelineParserVisitor):
                         component[prop] = value
             except (AttributeError, ValueError) as e:
                 self.add_error(f"Error modifying {component_id}.{prop}: {str(e)}", ctx, ExceptionType=AttributeError)
+        self._reference_index().modified(component, [prop for prop, _ in assignments])
         
         # Validate the component after all modifications
         try:
@@ -491,9 +634,8 @@ class TimelineInterpreter(TimelineParserVisitor):
                 if not component.date:
                     self.add_error(f"Invalid event {component_id}: date is not set", ctx, ExceptionType=ValidationError)
             elif isinstance(component, Timeline):
-                # Validate timeline components
-                if hasattr(component, 'validate_components'):
-                    component.validate_components()
+                # Re-check only the relationships a modify may have broken since it was validated
+                self._reference_index().revalidate(component)
             elif isinstance(component, Relationship):
                 # Validate relationship components exist and are properly linked
                 if not component.from_component or not component.to_component:
@@ -503,22 +645,21 @@ class TimelineInterpreter(TimelineParserVisitor):
                 
         return None
 
+    def _reference_index(self) -> ReferenceIndex:
+        if self._references is None:
+            self._references = ReferenceIndex(self.symbols)
+        return self._references
+
     def _generate_unique_display_id(self, base_id):
         """generate unique display ID for the component to be used in component selector in front-end"""
-        existing_count = 0
-        for exported_comp in self.exported_components:
-            if exported_comp['id'].startswith(base_id):
-                if exported_comp['id'] == base_id:
-                    existing_count = max(existing_count, 1)
-                elif exported_comp['id'].startswith(f"{base_id} (") and exported_comp['id'].endswith(")"):
-                    try:
-                        num_part = exported_comp['id'][len(base_id) + 2:-1]
-                        num = int(num_part)
-                        existing_count = max(existing_count, num + 1)
-                    except (ValueError, IndexError):
-                        pass
-
+        # The first export of an id keeps it, later ones become "id (1)", "id (2)", ...
+        existing_count = self._display_id_counts.get(base_id, 0)
         if existing_count == 0:
             return base_id
         else:
             return f"{base_id} ({existing_count})"
+
+    def _add_export(self, component_data, base_id):
+        """Record an exported component whose display id came from _generate_unique_display_id(base_id)"""
+        self.exported_components.append(component_data)
+        self._display_id_counts[base_id] = self._display_id_counts.get(base_id, 0) + 1
@@ -0,0 +1,46 @@
+import hashlib
+import json
+import time
+from src.lru_cache import LRUCache
+
+
+class CompileCache(LRUCache):
+    """Bounded LRU cache for compiled /visualize payloads, keyed by a hash of the submitted code."""
+
+    def __init__(self, max_size: int = 128, ttl: float = None):
+        super().__init__(max_size)  # key -> (stored_at, payload)
+        self.ttl = ttl  # seconds, None means entries never expire
+        self.expirations = 0
+
+    @staticmethod
+    def make_key(code: str, options: dict = None) -> str:
+        """Content hash of the code plus any options that change the produced payload"""
+        digest = hashlib.sha256(code.encode('utf-8'))
+        if options:
+            digest.update(b'\0')
+            digest.update(json.dumps(options, sort_keys=True, default=str).encode('utf-8'))
+        return digest.hexdigest()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def get(self, key: str):
+        """Return the stored payload for key, or None on a miss"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None and time.monotonic() - entry[0] > self.ttl:
+                del self._entries[key]
+                self.expirations += 1
+            entry = self._get(key)
+        return entry[1] if entry is not None else None
+
+    def put(self, key: str, payload: dict):
+        if not self.enabled:
+            return
+        super().put(key, (time.monotonic(), payload))
+
+    def _extra_stats(self) -> dict:
+        return {'ttl': self.ttl, 'expirations': self.expirations}
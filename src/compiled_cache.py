@@ -0,0 +1,101 @@
+import gc
+import hashlib
+import os
+import pickle
+import tempfile
+from src.TimelineLexer import serializedATN as lexer_atn
+from src.TimelineParser import serializedATN as parser_atn
+
+# Bump whenever the pickled layout of the models or of the cache body changes
+CACHE_FORMAT_VERSION = 4
+CACHE_MAGIC = b'TLC\0'
+CACHE_SUFFIX = 'c'  # script.timeline -> script.timelinec, next to the source
+
+# The only globals a cache may reference; anything else in the file is rejected
+CACHE_GLOBALS = frozenset([
+    ('src.models.date', '_unpickle'),
+    ('src.models.event', 'Event'),
+    ('src.models.period', 'Period'),
+    ('src.models.relationship', 'Relationship'),
+    ('src.models.timeline', 'Timeline'),
+])
+
+
+def _grammar_version() -> str:
+    digest = hashlib.sha256()
+    digest.update(repr(lexer_atn()).encode('ascii'))
+    digest.update(repr(parser_atn()).encode('ascii'))
+    return digest.hexdigest()[:16]
+
+
+GRAMMAR_VERSION = _grammar_version()
+
+
+def source_hash(code: str) -> str:
+    return hashlib.sha256(code.encode('utf-8')).hexdigest()
+
+
+def cache_path(source_path: str) -> str:
+    return source_path + CACHE_SUFFIX
+
+
+class _CacheUnpickler(pickle.Unpickler):
+    """Unpickler that resolves only the model classes, so a cache file cannot call anything else"""
+
+    def find_class(self, module, name):
+        if (module, name) not in CACHE_GLOBALS:
+            raise pickle.UnpicklingError(f"global '{module}.{name}' is not allowed in a compiled cache")
+        return super().find_class(module, name)
+
+
+def save(source_path: str, code: str, tables: dict, main_position=None):
+    """Write the interpreted symbol tables of code to the cache file next to source_path.
+
+    main_position is (char_index, line, column) of the main block in code, or None when
+    the script has no main block. The header is pickled separately from the body so a
+    stale cache is rejected without unpickling the model objects.
+    """
+    header = {
+        'format': CACHE_FORMAT_VERSION,
+        'grammar': GRAMMAR_VERSION,
+        'source': source_hash(code),
+        'main': main_position
+    }
+    path = cache_path(source_path)
+    directory = os.path.dirname(os.path.abspath(path))
+    # Write to a temporary file first so readers never see a half-written cache
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.timelinec-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(CACHE_MAGIC)
+            pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(tables, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def load(source_path: str, code: str):
+    """Return (tables, main_position) from a valid cache for code, or None if missing or stale"""
+    try:
+        with open(cache_path(source_path), 'rb') as f:
+            if f.read(len(CACHE_MAGIC)) != CACHE_MAGIC:
+                return None
+            header = _CacheUnpickler(f).load()
+            if (header.get('format') != CACHE_FORMAT_VERSION or
+                    header.get('grammar') != GRAMMAR_VERSION or
+                    header.get('source') != source_hash(code)):
+                return None
+            # Unpickling creates many objects at once; pausing the collector avoids
+            # repeated full traversals of a large heap while they are allocated
+            enabled = gc.isenabled()
+            gc.disable()
+            try:
+                return _CacheUnpickler(f).load(), header.get('main')
+            finally:
+                if enabled:
+                    gc.enable()
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        return None
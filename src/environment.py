@@ -0,0 +1,40 @@
+class Environment:
+    """Stack of loop-variable frames, one per enclosing for loop, innermost last.
+
+    Each frame is a slot holding the loop's current item. A name resolves to the
+    innermost frame that binds it, so a nested loop reusing a name shadows the outer
+    variable only until it ends. The compiled main block resolves names to slot
+    indexes ahead of time and reads values[slot] directly.
+    """
+
+    def __init__(self):
+        self.names = []   # variable bound by each frame, outermost first
+        self.values = []  # current value of each frame's variable
+
+    def push(self, name: str, value=None) -> int:
+        """Open a frame binding name, returning its slot index"""
+        self.names.append(name)
+        self.values.append(value)
+        return len(self.values) - 1
+
+    def pop(self):
+        self.names.pop()
+        self.values.pop()
+
+    def slot(self, name: str):
+        """Return the slot index of the innermost frame binding name, or None"""
+        names = self.names
+        for index in range(len(names) - 1, -1, -1):
+            if names[index] == name:
+                return index
+        return None
+
+    def lookup(self, name: str, default=None):
+        index = self.slot(name)
+        return self.values[index] if index is not None else default
+
+    def __contains__(self, name):
+        return self.slot(name) is not None
+
+    def __len__(self):
+        return len(self.names)
@@ -0,0 +1,177 @@
+import re
+from antlr4 import InputStream, Token
+from antlr4.CommonTokenFactory import CommonTokenFactory
+from antlr4.Lexer import TokenSource
+from antlr4.Recognizer import Recognizer
+from antlr4.Token import CommonToken
+from antlr4.error.Errors import LexerNoViableAltException
+from src.TimelineLexer import TimelineLexer
+
+# Every literal token of TimelineLexer.g4 that is also a valid identifier
+_KEYWORDS = {
+    name.strip("'"): token_type
+    for token_type, name in enumerate(TimelineLexer.literalNames)
+    if re.fullmatch(r"'[a-zA-Z_][a-zA-Z_0-9]*'", name)
+}
+
+_PUNCTUATION = {
+    '<=': TimelineLexer.LE,
+    '>=': TimelineLexer.GE,
+    '==': TimelineLexer.EQ_EQ,
+    '!=': TimelineLexer.NEQ,
+    '=': TimelineLexer.EQ,
+    ',': TimelineLexer.COMMA,
+    ';': TimelineLexer.SEMI,
+    '.': TimelineLexer.DOT,
+    '(': TimelineLexer.LPAREN,
+    ')': TimelineLexer.RPAREN,
+    '{': TimelineLexer.LCURLY,
+    '}': TimelineLexer.RCURLY,
+    '-': TimelineLexer.DASH,  # DASH is declared before ADD_OP, so a lone '-' is always DASH
+    '+': TimelineLexer.ADD_OP,
+    '<': TimelineLexer.LT,
+    '>': TimelineLexer.GT,
+}
+
+# Alternatives are ordered so that Python's first-match gives ANTLR's longest match.
+# Hyphenated keywords come before words because they extend an identifier prefix.
+_TOKEN_PATTERN = re.compile(r"""
+    (?P<WS>[ \t\n\r]+)
+  | (?P<COMMENT>//[^\r\n]*)
+  | (?P<HYPHENATED>cause-effect)
+  | (?P<WORD>[a-zA-Z_][a-zA-Z_0-9]*)
+  | (?P<INT>[0-9]+)
+  | (?P<STRING>"[^"\\]*")
+  | (?P<PUNCT><=|>=|==|!=|[=,;.(){}\-+<>])
+""", re.VERBOSE)
+
+
+class TimelineFastLexer(Recognizer, TokenSource):
+    """Hand-written drop-in replacement for the ANTLR-generated TimelineLexer.
+
+    Emits the same token types, text, channels, character offsets, lines and columns
+    as TimelineLexer, and reports unrecognised input to the error listeners with the
+    same "token recognition error" messages and positions. It can be handed to
+    CommonTokenStream in place of TimelineLexer.
+    """
+
+    symbolicNames = TimelineLexer.symbolicNames
+    literalNames = TimelineLexer.literalNames
+    ruleNames = TimelineLexer.ruleNames
+    grammarFileName = TimelineLexer.grammarFileName
+
+    def __init__(self, input: InputStream):
+        super().__init__()
+        self._input = input
+        self._factory = CommonTokenFactory.DEFAULT
+        self._tokenFactorySourcePair = (self, input)
+        self._text = input.strdata
+        self._pos = 0
+        self.line = 1
+        self._line_start = 0  # index where the current line starts, so column = pos - line_start
+        self._hitEOF = False
+
+    @property
+    def column(self):
+        return self._pos - self._line_start
+
+    @column.setter
+    def column(self, value: int):
+        self._line_start = self._pos - value
+
+    @property
+    def inputStream(self):
+        return self._input
+
+    def getInputStream(self):
+        return self._input
+
+    def getSourceName(self):
+        return self._input.getSourceName()
+
+    def getCharIndex(self):
+        return self._pos
+
+    def _advance(self, end: int):
+        """Move to end, keeping line/column in step the way the ANTLR simulator does"""
+        text = self._text
+        newlines = text.count('\n', self._pos, end)
+        if newlines:
+            self.line += newlines
+            self._line_start = text.rfind('\n', self._pos, end) + 1
+        self._pos = end
+
+    def _error_end(self, pos: int) -> int:
+        """Index of the character at which every lexer rule has failed for input starting at pos"""
+        text = self._text
+        char = text[pos]
+        if char in '!/':
+            # '!=' and '//' are the only rules starting with these characters
+            return pos + 1
+        if char == '"':
+            # An unterminated string, or one containing a backslash
+            end = pos + 1
+            while end < len(text) and text[end] not in '"\\':
+                end += 1
+            return end
+        return pos
+
+    def _report_error(self, pos: int, fail: int):
+        start_line, start_column = self.line, self.column
+        error_text = self._text[pos:fail + 1]
+        display = error_text.replace('\n', '\\n').replace('\t', '\\t').replace('\r', '\\r')
+        msg = "token recognition error at: '" + display + "'"
+        e = LexerNoViableAltException(self, self._input, pos, None)
+        for listener in self._listeners:
+            listener.syntaxError(self, None, start_line, start_column, msg, e)
+        # Skip the offending character, like Lexer.recover()
+        self._advance(min(fail + 1, len(self._text)))
+
+    def nextToken(self):
+        text = self._text
+        length = len(text)
+        match_token = _TOKEN_PATTERN.match
+        while True:
+            pos = self._pos
+            if pos >= length:
+                self._hitEOF = True
+                eof = CommonToken(self._tokenFactorySourcePair, Token.EOF, Token.DEFAULT_CHANNEL, pos, pos - 1)
+                eof.line = self.line
+                eof.column = self.column
+                return eof
+
+            match = match_token(text, pos)
+            if match is None:
+                self._report_error(pos, self._error_end(pos))
+                continue
+
+            kind = match.lastgroup
+            end = match.end()
+            if kind == 'WS' or kind == 'COMMENT':
+                self._advance(end)
+                continue
+
+            if kind == 'WORD':
+                token_type = _KEYWORDS.get(match.group(), TimelineLexer.ID)
+            elif kind == 'INT':
+                token_type = TimelineLexer.INT
+            elif kind == 'STRING':
+                token_type = TimelineLexer.STRING
+            elif kind == 'HYPHENATED':
+                token_type = TimelineLexer.CAUSE_EFFECT
+            else:
+                token_type = _PUNCTUATION[match.group()]
+
+            token = CommonToken(self._tokenFactorySourcePair, token_type, Token.DEFAULT_CHANNEL, pos, end - 1)
+            token.line = self.line
+            token.column = self.column
+            self._advance(end)
+            return token
+
+    def getAllTokens(self):
+        tokens = []
+        token = self.nextToken()
+        while token.type != Token.EOF:
+            tokens.append(token)
+            token = self.nextToken()
+        return tokens
@@ -0,0 +1,66 @@
+import pickle
+from src.lru_cache import LRUCache
+from src.timings import phase
+
+
+class ImageStore(LRUCache):
+    """Bounded LRU store of exported timelines whose PNGs are rendered on first request.
+
+    An export only pickles a snapshot of the timeline (later modify statements cannot
+    change it) and hands back its handle, the timeline's fingerprint. The PNG is
+    generated the first time png(handle) is called and kept in place of the snapshot,
+    so identical timelines share one handle and are rendered at most once. With a
+    render_pool the PNGs are drawn by its worker processes instead of the caller.
+    """
+
+    def __init__(self, max_size: int = 256, render_pool=None):
+        super().__init__(max_size)  # handle -> [snapshot, png bytes or None]
+        self.render_pool = render_pool
+        self.renders = 0
+
+    def add(self, timeline) -> str:
+        """Snapshot timeline and return the handle its PNG can be fetched with"""
+        handle = timeline.fingerprint()
+        with self._lock:
+            if handle in self._entries:
+                self._entries.move_to_end(handle)
+                return handle
+
+        snapshot = pickle.dumps(timeline, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._put(handle, self._entries.get(handle) or [snapshot, None])
+        return handle
+
+    def png(self, handle: str):
+        """Return the PNG bytes for handle, rendering them on first use, or None if unknown"""
+        with self._lock:
+            entry = self._entries.get(handle)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(handle)
+            snapshot, png = entry
+            if png is not None:
+                self.hits += 1
+                return png
+
+        # Render outside the lock so other images can be served meanwhile
+        if self.render_pool is not None:
+            with phase('render_wait'):
+                png = self.render_pool.submit_snapshot(snapshot).result()
+        else:
+            png = pickle.loads(snapshot).generate_png_bytes()
+        with self._lock:
+            entry[0], entry[1] = None, png
+            self.renders += 1
+        return png
+
+    def __contains__(self, handle):
+        with self._lock:
+            return handle in self._entries
+
+    def _extra_stats(self) -> dict:
+        return {
+            'rendered': sum(1 for _, png in self._entries.values() if png is not None),
+            'renders': self.renders
+        }
@@ -0,0 +1,156 @@
+import copy
+import re
+from antlr4 import Token
+from src.TimelineInterpreter import TimelineInterpreter
+from src.lru_cache import LRUCache
+from src.models import Event, Period
+from src.pipeline import create_parser
+
+DECLARATION_KEYWORDS = {"event", "period", "timeline", "relationship"}
+
+# Strings and comments may contain braces, so they are matched (and skipped) as a whole
+BLOCK_SCAN = re.compile(r'"[^"\\]*"?|//[^\r\n]*|[{}]')
+LEADING_KEYWORD = re.compile(r'(?:\s|//[^\r\n]*)*([A-Za-z_][A-Za-z_0-9]*)')
+TRAILING_TRIVIA = re.compile(r'(?:\s|//[^\r\n]*)*')
+
+
+class IncrementalFrontend:
+    """Parses and interprets a script one top-level declaration at a time, reusing unchanged ones.
+
+    The source is split at top-level declaration boundaries with a cheap brace scan.
+    Each declaration's parse subtree is cached by its exact text, as is the interpreted
+    Event/Period it produced, so an edit only re-parses the declarations that changed
+    plus the main block. Relationships and timelines are re-interpreted from their
+    cached subtrees because they hold references to the current component objects.
+
+    The fast path only handles scripts that split and parse cleanly and whose declarations
+    interpret cleanly. For anything else prepare() returns None and the caller should use
+    the full parse, which reports errors with their exact positions. The main block is
+    parsed at its position in the script, so errors raised while running it are exact
+    and are reported as they are, without running the script a second time.
+    """
+
+    def __init__(self, max_entries: int = 100000, lexer: str = 'antlr'):
+        self.lexer = lexer
+        self._subtrees = LRUCache(max_entries)  # declaration text -> [subtree, pristine model or None]
+
+    def split(self, code: str):
+        """Split code into (keyword, text) chunks, or return None if it is not cleanly splittable"""
+        chunks = []
+        depth = 0
+        chunk_start = 0
+        for match in BLOCK_SCAN.finditer(code):
+            token = match.group()
+            if token == '{':
+                depth += 1
+            elif token == '}':
+                depth -= 1
+                if depth < 0:
+                    return None
+                if depth == 0:
+                    text = code[chunk_start:match.end()]
+                    keyword = LEADING_KEYWORD.match(text)
+                    if not keyword:
+                        return None
+                    chunks.append((keyword.group(1), text))
+                    chunk_start = match.end()
+
+        # Only whitespace and comments may follow the last block
+        if depth != 0 or TRAILING_TRIVIA.fullmatch(code, chunk_start) is None:
+            return None
+
+        for i, (keyword, _) in enumerate(chunks):
+            if keyword == "main":
+                if i != len(chunks) - 1:
+                    return None
+            elif keyword not in DECLARATION_KEYWORDS:
+                return None
+        return chunks
+
+    def _parse_chunk(self, text: str, rule: str, position=None):
+        """Parse text as a single declaration or main block, returning None on any error.
+
+        position is the (line, column) at which text starts in its script.
+        """
+        parser, lexer_errors, parser_errors = create_parser(text, self.lexer, position)
+        tree = getattr(parser, rule)()
+        if lexer_errors.errors or parser_errors.errors or parser.getTokenStream().LA(1) != Token.EOF:
+            return None
+        return tree
+
+    def parse(self, code: str):
+        """Return ([(keyword, text, subtree), ...], main_subtree) or None"""
+        chunks = self.split(code)
+        if chunks is None:
+            return None
+
+        declarations = []
+        main_block = None
+        offset = 0  # chunks are contiguous, so this is where the current one starts in code
+        for keyword, text in chunks:
+            start = offset
+            offset += len(text)
+            if keyword == "main":
+                line = code.count('\n', 0, start) + 1
+                column = start - (code.rfind('\n', 0, start) + 1)
+                main_block = self._parse_chunk(text, "mainBlock", (line, column))
+                if main_block is None:
+                    return None
+                continue
+
+            entry = self._subtrees.get(text)
+            if entry is None:
+                subtree = self._parse_chunk(text, "declaration")
+                if subtree is None:
+                    return None
+                entry = [subtree, None]
+                self._subtrees.put(text, entry)
+            declarations.append((keyword, text, entry))
+        return declarations, main_block
+
+    def prepare(self, code: str, interpreter: TimelineInterpreter = None):
+        """Interpret the declarations of code incrementally, returning (interpreter, main subtree or None).
+
+        Returns None if the fast path does not apply. Main has not run yet; running it is
+        left to the caller, which reports its errors like those of a full parse.
+        """
+        parsed = self.parse(code)
+        if parsed is None:
+            return None
+        declarations, main_block = parsed
+
+        interpreter = interpreter or TimelineInterpreter()
+        try:
+            for keyword, text, entry in declarations:
+                subtree, model = entry
+                if model is not None:
+                    # Main may modify the model, so every run gets its own copy
+                    interpreter.register_component(copy.copy(model), subtree)
+                    continue
+
+                interpreter.visit(subtree)
+                if keyword == "event":
+                    model = interpreter.events.get(subtree.eventDecl().ID().getText())
+                elif keyword == "period":
+                    model = interpreter.periods.get(subtree.periodDecl().ID().getText())
+                if isinstance(model, (Event, Period)):
+                    entry[1] = copy.copy(model)
+        except Exception:
+            return None
+        return interpreter, main_block
+
+    def run(self, code: str, interpreter: TimelineInterpreter = None):
+        """Interpret code incrementally, returning the interpreter or None if the fast path does not apply.
+
+        Errors raised by the main block propagate to the caller.
+        """
+        prepared = self.prepare(code, interpreter)
+        if prepared is None:
+            return None
+        interpreter, main_block = prepared
+        if main_block is not None:
+            interpreter.visit(main_block)
+        return interpreter
+
+    def stats(self) -> dict:
+        return self._subtrees.stats()
@@ -0,0 +1,214 @@
+from src.TimelineParser import TimelineParser
+from src.main_optimizer import RAISES, branch
+
+
+def compile_main_block(interpreter, ctx: TimelineParser.MainBlockContext, optimizer=None):
+    """Lower a mainBlock subtree into a closure that runs it on interpreter.
+
+    Every statement, condition and expression becomes a Python closure with its
+    identifiers, property names and literals resolved once at compile time, so loops
+    no longer pay for visitor dispatch, getText() and string clean-up on every
+    iteration. The closures call the same TimelineInterpreter helpers as the visitor
+    methods (export_component, modify_component, get_property, ...), so the compiled
+    program behaves exactly like walking the tree.
+
+    Loop variables are resolved to the slot of their for loop's frame in
+    interpreter.environment while compiling, so reading one is a single list index.
+
+    With a MainOptimizer, constant conditions are folded and dead branches, unreachable
+    statements and empty loops are left out of the compiled program.
+    """
+    return _compile_block(interpreter, ctx.statement(), (), optimizer) or _noop
+
+
+def _noop():
+    pass
+
+
+def _resolve_slot(scope, name):
+    """Slot of the innermost enclosing loop binding name (scope lists the loop variables, outermost first)"""
+    for index in range(len(scope) - 1, -1, -1):
+        if scope[index] == name:
+            return index
+    return None
+
+
+def _loop_value(interpreter, scope, name):
+    """Return a closure giving name's loop-variable value, or None when name is not a loop variable"""
+    slot = _resolve_slot(scope, name)
+    if slot is None:
+        return lambda: None
+    values = interpreter.environment.values
+    return lambda: values[slot]
+
+
+def _compile_block(interpreter, statements, scope, optimizer):
+    """Compile statements into one closure, or None when nothing in them needs to run"""
+    ops = []
+    for index, stmt in enumerate(statements):
+        op = _compile_statement(interpreter, stmt, scope, optimizer)
+        if op is not None:
+            ops.append(op)
+        if optimizer is not None and optimizer.always_raises(stmt, scope):
+            for unreachable in statements[index + 1:]:
+                optimizer.remove(unreachable, f"unreachable: the statement at line {stmt.start.line} always fails")
+            break
+    if not ops:
+        return None
+    if len(ops) == 1:
+        return ops[0]
+
+    def run_block():
+        for op in ops:
+            op()
+    return run_block
+
+
+def _compile_statement(interpreter, ctx: TimelineParser.StatementContext, scope, optimizer):
+    if ctx.exportStmt():
+        return _compile_export(interpreter, ctx.exportStmt(), scope)
+    if ctx.ifStmt():
+        return _compile_if(interpreter, ctx.ifStmt(), scope, optimizer)
+    if ctx.forStmt():
+        return _compile_for(interpreter, ctx.forStmt(), scope, optimizer)
+    if ctx.modifyStmt():
+        return _compile_modify(interpreter, ctx.modifyStmt(), scope)
+    # An empty statement (a lone ';') does nothing
+    return None
+
+
+def _compile_export(interpreter, ctx: TimelineParser.ExportStmtContext, scope):
+    export_component = interpreter.export_component
+    export_id = ctx.ID().getText()
+    loop_value = _loop_value(interpreter, scope, export_id)
+    return lambda: export_component(export_id, ctx, loop_value())
+
+
+def _compile_if(interpreter, ctx: TimelineParser.IfStmtContext, scope, optimizer):
+    condition = _compile_condition(interpreter, ctx.condition(), scope, optimizer)
+    statements = ctx.statement()
+    if condition is True or condition is False:
+        # Only the branch that can run is compiled, in place of the if
+        dead = branch(ctx, not condition)
+        if dead:
+            optimizer.remove(ctx, f"condition is always {str(condition).lower()}: removed the "
+                                  f"{'else' if condition else 'then'} branch ({len(dead)} statement{'s' if len(dead) != 1 else ''})")
+        elif not branch(ctx, condition):
+            optimizer.remove(ctx, f"condition is always {str(condition).lower()} and the branch taken is empty")
+        return _compile_block(interpreter, branch(ctx, condition), scope, optimizer)
+
+    if ctx.ELSE() is None:
+        then_block = _compile_block(interpreter, statements, scope, optimizer) or _noop
+
+        def run_if():
+            if condition():
+                then_block()
+        return run_if
+
+    # Same split of the statements between the branches as visitIfStmt
+    then_block = _compile_block(interpreter, statements[:len(statements) // 2], scope, optimizer) or _noop
+    else_block = _compile_block(interpreter, statements[len(statements) // 2:], scope, optimizer) or _noop
+
+    def run_if_else():
+        if condition():
+            then_block()
+        else:
+            else_block()
+    return run_if_else
+
+
+def _compile_for(interpreter, ctx: TimelineParser.ForStmtContext, scope, optimizer):
+    iter_var = ctx.ID(0).getText()
+    collection_id = ctx.ID(1).getText()
+    # run_loop pushes the frame for iter_var at slot len(scope)
+    body = _compile_block(interpreter, ctx.statement(), scope + (iter_var,), optimizer)
+    if body is None:
+        if optimizer is not None and not optimizer.always_raises(ctx.parentCtx, scope):
+            optimizer.remove(ctx, "loop body is empty")
+            return None
+        body = _noop
+
+    def run_for():
+        collection = interpreter.loop_collection(collection_id, ctx)
+        if collection is not None:
+            interpreter.run_loop(iter_var, collection, body)
+    return run_for
+
+
+def _compile_modify(interpreter, ctx: TimelineParser.ModifyStmtContext, scope):
+    modify_component = interpreter.modify_component
+    component_id = ctx.ID().getText()
+    loop_value = _loop_value(interpreter, scope, component_id)
+    assignments = [
+        (assignment.property_().getText().lower(), _compile_expr(interpreter, assignment.expr(), scope))
+        for assignment in ctx.propertyAssignment()
+    ]
+    return lambda: modify_component(component_id, assignments, ctx, loop_value())
+
+
+def _compile_condition(interpreter, ctx: TimelineParser.ConditionContext, scope, optimizer=None):
+    """Compile a condition to a closure, or to True/False when the optimizer folds it"""
+    if ctx.comparisonOp():
+        compare = interpreter.compare
+        left = _compile_expr(interpreter, ctx.expr(0), scope)
+        right = _compile_expr(interpreter, ctx.expr(1), scope)
+        if optimizer is not None:
+            value = optimizer.fold_condition(ctx, left, right, scope)
+            if value is True or value is False:
+                return value
+        op = ctx.comparisonOp().getText()
+        return lambda: compare(left(), right(), op, ctx)
+    if optimizer is not None:
+        value = optimizer.fold_condition(ctx, None, None, scope)
+        if value is True or value is False:
+            return value
+    if ctx.ID():
+        is_declared = interpreter.is_declared
+        comp_id = ctx.ID().getText()
+        return lambda: is_declared(comp_id)
+    if ctx.booleanLiteral():
+        value = ctx.booleanLiteral().getText().lower() == "true"
+        return lambda: value
+    return lambda: False
+
+
+def _compile_expr(interpreter, ctx: TimelineParser.ExprContext, scope):
+    if ctx.ID() and ctx.property_():
+        get_property = interpreter.get_property
+        obj_id = ctx.ID().getText()
+        prop = ctx.property_().getText().lower()
+        loop_value = _loop_value(interpreter, scope, obj_id)
+        return lambda: get_property(obj_id, prop, ctx, loop_value())
+    if ctx.STRING():
+        value = ctx.STRING().getText().strip('"')
+        return lambda: value
+    if ctx.INT():
+        value = int(ctx.INT().getText())
+        return lambda: value
+    if ctx.dateExpr():
+        return _compile_date(interpreter, ctx.dateExpr())
+    if ctx.importanceValue():
+        value = ctx.importanceValue().getText().upper()
+        return lambda: value
+    if ctx.ID():
+        # A loop variable evaluates to its item, any other name to itself
+        name = ctx.ID().getText()
+        slot = _resolve_slot(scope, name)
+        if slot is None:
+            return lambda: name
+        values = interpreter.environment.values
+        return lambda: values[slot]
+    return lambda: None
+
+
+def _compile_date(interpreter, ctx: TimelineParser.DateExprContext):
+    # Date literals are folded once; anything else is left to visitDateExpr at run time
+    if ctx.yearLiteral() or ctx.monthYearLiteral() or ctx.fullDateLiteral():
+        try:
+            value = interpreter.visitDateExpr(ctx)
+        except Exception:
+            value = None
+        if isinstance(value, dict):
+            # Each evaluation gets its own dict, as visitDateExpr would return
+            return lambda: dict(value)
+    return lambda: interpreter.visitDateExpr(ctx)
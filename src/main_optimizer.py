@@ -0,0 +1,163 @@
+from src.TimelineParser import TimelineParser
+from src.symbol_table import EVENT, PERIOD, TIMELINE
+
+
+class MainOptimizer:
+    """Static analysis of a mainBlock, run after the declarations and before main itself.
+
+    The only statement that changes a component is modify, so a property that no
+    modify in main can reach keeps its declared value for the whole run. Conditions
+    built from literals, declared names and such properties are folded to a constant,
+    which lets the compiler drop the branch that can never run. A statement that raises
+    whenever it runs (exporting or modifying an undeclared name, ...) ends its block,
+    so the statements after it are unreachable and dropped too.
+
+    Everything that is dropped is recorded in removed, for the debug view.
+    """
+
+    def __init__(self, interpreter, ctx: TimelineParser.MainBlockContext):
+        self.interpreter = interpreter
+        self.removed = []  # {'line', 'column', 'statement', 'reason'} per removed piece of code
+        self._modified = set()  # (id(component), property) pairs some modify may assign
+        self._conditions = {}  # condition ctx -> folded value
+        self._find_modified(ctx.statement(), ())
+
+    def _find_modified(self, statements, loops):
+        """Collect what every modify can reach; loops lists (variable, items of its collection) per enclosing loop"""
+        for stmt in statements:
+            if stmt.modifyStmt():
+                modify = stmt.modifyStmt()
+                name = modify.ID().getText()
+                props = [assignment.property_().getText().lower() for assignment in modify.propertyAssignment()]
+                items = next((loop_items for var, loop_items in reversed(loops) if var == name), None)
+                if items is None:
+                    component = self.interpreter.symbols.get(name)
+                    items = [component] if component is not None else []
+                self._modified.update((id(item), prop) for item in items for prop in props)
+            elif stmt.ifStmt():
+                self._find_modified(stmt.ifStmt().statement(), loops)
+            elif stmt.forStmt():
+                loop = stmt.forStmt()
+                items = self._collection(loop.ID(1).getText()) or []
+                self._find_modified(loop.statement(), loops + ((loop.ID(0).getText(), items),))
+
+    def _collection(self, collection_id):
+        """The items a loop over collection_id iterates, or None when it raises (same lookup as loop_collection)"""
+        kind, component = self.interpreter.symbols.lookup(collection_id) or (None, None)
+        if kind == TIMELINE:
+            return component.components if hasattr(component, 'components') else []
+        if kind in (EVENT, PERIOD):
+            return [component]
+        return None
+
+    def is_static(self, expr: TimelineParser.ExprContext, scope):
+        """Whether expr evaluates to the same value (or error) every time main reaches it"""
+        if expr.ID() and expr.property_():
+            obj_id = expr.ID().getText()
+            component = self.interpreter.symbols.get(obj_id)
+            if component is None:
+                # A loop variable, or a name that is always reported as not found
+                return obj_id not in scope
+            return (id(component), expr.property_().getText().lower()) not in self._modified
+        if expr.dateExpr():
+            return expr.dateExpr().dateCalculation() is None
+        if expr.ID():
+            return expr.ID().getText() not in scope
+        return True
+
+    def fold_condition(self, condition: TimelineParser.ConditionContext, left, right, scope):
+        """Return True or False when condition is constant, RAISES when evaluating it always fails, else None.
+
+        left and right are the compiled operand closures of a comparison.
+        """
+        if condition in self._conditions:
+            return self._conditions[condition]
+
+        value = None
+        if condition.comparisonOp():
+            operands = [(expr, self._static_operand(expr, compiled, scope))
+                        for expr, compiled in ((condition.expr(0), left), (condition.expr(1), right))]
+            if all(operand is not None for _, operand in operands):
+                op = condition.comparisonOp().getText()
+                value = self._evaluate(lambda: self.interpreter.compare(operands[0][1](), operands[1][1](), op, condition))
+            elif any(operand is not None and self._evaluate(operand) is RAISES for _, operand in operands):
+                value = RAISES
+        elif condition.ID():
+            value = self.interpreter.is_declared(condition.ID().getText())
+        elif condition.booleanLiteral():
+            value = condition.booleanLiteral().getText().lower() == "true"
+        else:
+            value = False
+        if value is not RAISES and value is not None:
+            value = bool(value)
+        self._conditions[condition] = value
+        return value
+
+    def _static_operand(self, expr, compiled, scope):
+        """A closure evaluating a static expr at compile time, or None if expr is not static"""
+        if not self.is_static(expr, scope):
+            return None
+        if expr.ID() and expr.property_():
+            # Static property reads never use the loop variable, whose frame does not exist yet
+            obj_id, prop = expr.ID().getText(), expr.property_().getText().lower()
+            return lambda: self.interpreter.get_property(obj_id, prop, expr, None)
+        return compiled
+
+    def _evaluate(self, fn):
+        """Call fn now, returning RAISES (and leaving no error recorded) if it fails"""
+        errors = self.interpreter.interpretation_errors
+        recorded = len(errors)
+        try:
+            return fn()
+        except Exception:
+            del errors[recorded:]
+            return RAISES
+
+    def always_raises(self, stmt: TimelineParser.StatementContext, scope):
+        """Whether running stmt is certain to raise an error"""
+        symbols = self.interpreter.symbols
+        if stmt.exportStmt():
+            name = stmt.exportStmt().ID().getText()
+            return name not in scope and symbols.lookup(name) is None
+        if stmt.modifyStmt():
+            name = stmt.modifyStmt().ID().getText()
+            return name not in scope and symbols.get(name) is None
+        if stmt.ifStmt():
+            value = self._conditions.get(stmt.ifStmt().condition())
+            if value is RAISES:
+                return True
+            if value is None:
+                return False
+            return any(self.always_raises(inner, scope) for inner in branch(stmt.ifStmt(), value))
+        if stmt.forStmt():
+            loop = stmt.forStmt()
+            items = self._collection(loop.ID(1).getText())
+            if items is None:
+                return True
+            inner_scope = scope + (loop.ID(0).getText(),)
+            return bool(items) and any(self.always_raises(inner, inner_scope) for inner in loop.statement())
+        return False
+
+    def remove(self, ctx, reason):
+        start = ctx.start
+        source = start.getInputStream()
+        text = source.getText(start.start, ctx.stop.stop) if ctx.stop is not None else ctx.getText()
+        self.removed.append({
+            'line': start.line,
+            'column': start.column,
+            'statement': ' '.join(text.split()),
+            'reason': reason
+        })
+
+
+# fold_condition result for a condition whose evaluation raises every time
+RAISES = object()
+
+
+def branch(ctx: TimelineParser.IfStmtContext, value: bool):
+    """The statements an if runs when its condition is value (same split as visitIfStmt)"""
+    statements = ctx.statement()
+    if ctx.ELSE() is None:
+        return statements if value else []
+    half = len(statements) // 2
+    return statements[:half] if value else statements[half:]
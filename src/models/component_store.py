@@ -0,0 +1,107 @@
+import numpy as np
+from .event import Event
+
+# Days per month, indexed by month (index 0 is unused)
+DAYS_PER_MONTH = np.array([31, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31], dtype=np.int64)
+
+
+class ComponentStore:
+    """Columnar copy of a timeline's events and periods, one row per component.
+
+    Ids, importance codes, start/end sort keys and start/end decimal years are kept in
+    parallel NumPy arrays, so the date range, the orderings the layout needs and the
+    conversion of every date to a decimal year are each one array operation. An event
+    is a row whose start and end are both its date. The Event and Period objects stay
+    the source of truth: a store is built from them for one render and never written back.
+    """
+
+    def __init__(self, components):
+        self.components = list(components)
+        self._starts = [component.date if isinstance(component, Event) else component.start for component in self.components]
+        self._ends = [component.date if isinstance(component, Event) else component.end for component in self.components]
+        self._rows = None  # id(component) -> row, built by the first lookup
+
+        n = len(self.components)
+        self._objects = np.empty(n, dtype=object)
+        self._objects[:] = self.components
+        self.ids = np.array([component.id for component in self.components], dtype=object)
+        self.is_event = np.fromiter((isinstance(component, Event) for component in self.components), dtype=bool, count=n)
+        # The components' own importance codes, indices into IMPORTANCE_LEVELS (most important first)
+        self.importance = np.fromiter((component._importance for component in self.components), dtype=np.int8, count=n)
+        self.start_keys = np.fromiter((date.sort_key for date in self._starts), dtype=np.int64, count=n)
+        self.end_keys = np.fromiter((date.sort_key for date in self._ends), dtype=np.int64, count=n)
+        self.start_years, self.start_months, self.start_days = decode_keys(self.start_keys)
+        self.end_years, self.end_months, self.end_days = decode_keys(self.end_keys)
+        self.start_positions = decimal_years(self.start_years, self.start_months, self.start_days)
+        self.end_positions = decimal_years(self.end_years, self.end_months, self.end_days)
+        # Plain floats for the per-component lookups of the drawing code
+        self._start_list = self.start_positions.tolist()
+        self._end_list = self.end_positions.tolist()
+
+    def __len__(self):
+        return len(self.components)
+
+    def row(self, component) -> int:
+        if self._rows is None:
+            self._rows = {id(component): row for row, component in enumerate(self.components)}
+        return self._rows[id(component)]
+
+    def position(self, component) -> float:
+        """Decimal year of an event's date or of a period's start"""
+        return self._start_list[self.row(component)]
+
+    def span(self, component):
+        """(start, end) decimal years of a component"""
+        row = self.row(component)
+        return self._start_list[row], self._end_list[row]
+
+    def date_range(self):
+        """The earliest and the latest date of all components"""
+        keys = np.concatenate((self.start_keys, self.end_keys))
+        dates = self._starts + self._ends
+        return dates[int(np.argmin(keys))], dates[int(np.argmax(keys))]
+
+    def _ordered(self, *keys):
+        """Components sorted by keys, the first one primary (stable, like sorted())"""
+        return self._objects[np.lexsort(keys[::-1])].tolist()
+
+    def level_order(self):
+        """Order in which labels are placed: by start year, then an event's month and day"""
+        months = np.where(self.is_event, self.start_months, 0)
+        days = np.where(self.is_event, self.start_days, 0)
+        return self._ordered(self.start_years, months, days)
+
+    def period_order(self):
+        """Periods by start year, then end year"""
+        periods = np.flatnonzero(~self.is_event)
+        order = np.lexsort((self.end_years[periods], self.start_years[periods]))
+        return self._objects[periods[order]].tolist()
+
+    def drawing_order(self):
+        """By decimal start year, less important components first (drawn underneath) on ties"""
+        return self._ordered(self.start_positions, -self.importance.astype(np.int64))
+
+
+def decode_keys(keys):
+    """Years, months and days packed into Date sort keys, with 0 for a missing month or day"""
+    # Floor division and modulo undo (year * 13 + month) * 32 + day for negative years too
+    days = keys % 32
+    months = keys // 32 % 13
+    years = keys // 32 // 13
+    return years, months, days
+
+
+def days_in_month(years, months):
+    """Vectorized Date._days_in_month; months of 0 count as January"""
+    calc_years = np.where(years > 0, years, np.abs(years) + 1)
+    leap = (calc_years % 4 == 0) & ((calc_years % 100 != 0) | (calc_years % 400 == 0))
+    months = np.maximum(months, 1)
+    return DAYS_PER_MONTH[months] + ((months == 2) & leap)
+
+
+def decimal_years(years, months, days):
+    """Vectorized Timeline._date_to_decimal, adding the same terms in the same order so the floats are identical"""
+    positions = years.astype(np.float64)
+    positions = positions + np.where(months > 0, (months - 1) / 12, 0.0)
+    positions = positions + np.where(days > 0, (days - 1) / (days_in_month(years, months) * 12), 0.0)
+    return positions
@@ -1,38 +1,77 @@
-from dataclasses import dataclass
+import threading
+from collections import OrderedDict
 from typing import Dict, Optional
 
-@dataclass
+
+_set = object.__setattr__
+
+
+def _sort_key(year: int, month: Optional[int], day: Optional[int]) -> int:
+    # (year, month, day) packed into one int, with 0 for a missing month or day so a
+    # partial date sorts before every more precise date within the same year or month
+    return (year * 13 + (month or 0)) * 32 + (day or 0)
+
+
 class Date:
-    year: int
-    month: Optional[int] = None
-    day: Optional[int] = None
+    """A year, optionally narrowed to a month and then to a day.
+
+    Dates compare and hash on sort_key, computed once at construction: within the
+    same year a date without a month comes before every date with one, and within
+    the same month a date without a day before every date with one.
+    """
+    __slots__ = ('year', 'month', 'day', 'sort_key')
 
     def __init__(self, date_dict: Dict):
         if 'year' not in date_dict:
             raise ValueError("Year is required")
         
-        self.year = date_dict.get('year')
-        self.month = date_dict.get('month')
-        self.day = date_dict.get('day')
+        year = date_dict.get('year')
+        month = date_dict.get('month')
+        day = date_dict.get('day')
 
-        if not isinstance(self.year, int):
+        if not isinstance(year, int):
             raise ValueError("Year must be an integer")
 
-        if self.month is not None:
-            if not isinstance(self.month, int):
+        if month is not None:
+            if not isinstance(month, int):
                 raise ValueError("Month must be an integer")
-            if not 1 <= self.month <= 12:
+            if not 1 <= month <= 12:
                 raise ValueError("Month must be between 1 and 12")
 
-        if self.day is not None:
-            if not isinstance(self.day, int):
+        if day is not None:
+            if not isinstance(day, int):
                 raise ValueError("Day must be an integer")
-            if self.month is None:
+            if month is None:
                 raise ValueError("Cannot specify day without month")
 
-            days_in_month = self._days_in_month(self.year, self.month)
-            if not 1 <= self.day <= days_in_month:
-                raise ValueError(f"Day must be between 1 and {days_in_month} for month {self.month}")
+            days_in_month = self._days_in_month(year, month)
+            if not 1 <= day <= days_in_month:
+                raise ValueError(f"Day must be between 1 and {days_in_month} for month {month}")
+
+        self._assign(year, month, day)
+
+    @classmethod
+    def of(cls, year: int, month: Optional[int] = None, day: Optional[int] = None) -> 'Date':
+        """Build a date from ints known to be valid, without the checks of the dict constructor"""
+        date = cls.__new__(cls)
+        date._assign(year, month, day)
+        return date
+
+    def _assign(self, year, month, day):
+        # Dates are shared (see DateInterner), so they are set once here and never again
+        _set(self, 'year', year)
+        _set(self, 'month', month)
+        _set(self, 'day', day)
+        _set(self, 'sort_key', _sort_key(year, month, day))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Date is immutable, cannot set '{name}'")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"Date is immutable, cannot delete '{name}'")
+
+    def __reduce__(self):
+        return (_unpickle, (self.year, self.month, self.day))
 
     def _days_in_month(self, year: int, month: int) -> int:
         days_per_month = [0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
@@ -68,50 +107,114 @@ class Date:
         
         return "-".join(parts)
 
+    def __repr__(self) -> str:
+        return f"Date(year={self.year!r}, month={self.month!r}, day={self.day!r})"
+
     def __lt__(self, other):
         if not isinstance(other, Date):
             raise TypeError("Can only compare with another Date object")
-        
-        # Compare years first
-        if self.year != other.year:
-            return self.year < other.year
-            
-        # If months are available, compare them
-        if self.month is not None and other.month is not None:
-            if self.month != other.month:
-                return self.month < other.month
-        elif self.month is not None:
-            # If this date has a month but other doesn't, this is more specific
-            return False
-        elif other.month is not None:
-            # If other date has a month but this doesn't, other is more specific
-            return True
-                
-        # If days are available, compare them
-        if self.day is not None and other.day is not None:
-            if self.day != other.day:
-                return self.day < other.day
-        elif self.day is not None:
-            # If this date has a day but other doesn't, this is more specific
-            return False
-        elif other.day is not None:
-            # If other date has a day but this doesn't, other is more specific
-            return True
-            
-        return False
+        return self.sort_key < other.sort_key
 
     def __eq__(self, other):
         if not isinstance(other, Date):
             return False
-        return (self.year == other.year and 
-                self.month == other.month and 
-                self.day == other.day)
+        return self.sort_key == other.sort_key
+
+    def __hash__(self):
+        return hash(self.sort_key)
 
     def __le__(self, other):
-        return self < other or self == other
+        if not isinstance(other, Date):
+            raise TypeError("Can only compare with another Date object")
+        return self.sort_key <= other.sort_key
 
     def __gt__(self, other):
-        return not self <= other
+        if not isinstance(other, Date):
+            raise TypeError("Can only compare with another Date object")
+        return self.sort_key > other.sort_key
 
     def __ge__(self, other):
-        return not self < other 
\ No newline at end of file
+        if not isinstance(other, Date):
+            raise TypeError("Can only compare with another Date object")
+        return self.sort_key >= other.sort_key
+
+
+class DateInterner:
+    """Bounded cache handing out one shared, immutable Date per (year, month, day).
+
+    Scripts repeat the same dates and tick generation steps through the same days, so
+    components and ticks asking for an equal date get the same object instead of a new
+    one. When the cache is full the oldest date is dropped: dates built after that are
+    still equal to earlier ones, just no longer the same object.
+    """
+
+    def __init__(self, max_size: int = 65536):
+        self.max_size = max_size  # 0 turns interning off
+        self._dates = OrderedDict()  # (year, month, day) -> Date, oldest first
+        self._lock = threading.Lock()
+        # Hits are counted without the lock, so under concurrent requests they are approximate
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, year: int, month: Optional[int] = None, day: Optional[int] = None) -> Date:
+        """The shared date for ints known to be valid (as for Date.of)"""
+        date = self._dates.get((year, month, day))
+        if date is not None:
+            self.hits += 1
+            return date
+        return self._add(Date.of(year, month, day))
+
+    def from_dict(self, date_dict: Dict) -> Date:
+        """The shared date equal to Date(date_dict), raising the same errors when date_dict is invalid"""
+        if isinstance(date_dict, dict):
+            year, month, day = date_dict.get('year'), date_dict.get('month'), date_dict.get('day')
+            # Only valid dates of plain ints are cached: 1.0 or True would otherwise hit the entry for 1
+            if _plain(year, month, day):
+                date = self._dates.get((year, month, day))
+                if date is not None:
+                    self.hits += 1
+                    return date
+        return self._add(Date(date_dict))
+
+    def _add(self, date: Date) -> Date:
+        with self._lock:
+            self.misses += 1
+            if self.max_size <= 0 or not _plain(date.year, date.month, date.day):
+                return date
+            # Another thread may have added the same date since the lookup
+            date = self._dates.setdefault((date.year, date.month, date.day), date)
+            while len(self._dates) > self.max_size:
+                self._dates.popitem(last=False)
+                self.evictions += 1
+            return date
+
+    def clear(self):
+        with self._lock:
+            self._dates.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._dates),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+    def __len__(self):
+        return len(self._dates)
+
+
+def _plain(year, month, day) -> bool:
+    return type(year) is int and (month is None or type(month) is int) and (day is None or type(day) is int)
+
+# Process-wide interner used by the models and the interpreter
+interned_dates = DateInterner()
+
+
+def _unpickle(year, month, day):
+    return interned_dates.get(year, month, day)
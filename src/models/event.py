@@ -2,12 +2,14 @@ import json
 import os
 from typing import Dict
 from .timeline_component import TimelineComponent
-from .date import Date
+from .date import interned_dates
 
 class Event(TimelineComponent):
+    __slots__ = ('date',)
+
     def __init__(self, id: str, title: str, date: Dict, importance: str = "MEDIUM"):
         super().__init__(id, title, importance)
-        self.date = Date(date)
+        self.date = interned_dates.from_dict(date)
 
     def to_dict(self) -> dict:
         base_dict = super().to_dict()
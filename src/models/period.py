@@ -2,13 +2,15 @@ import json
 import os
 from typing import Dict
 from .timeline_component import TimelineComponent
-from .date import Date
+from .date import interned_dates
 
 class Period(TimelineComponent):
+    __slots__ = ('start', 'end')
+
     def __init__(self, id: str, title: str, start: Dict, end: Dict, importance: str = "MEDIUM"):
         super().__init__(id, title, importance)
-        self.start = Date(start)
-        self.end = Date(end)
+        self.start = interned_dates.from_dict(start)
+        self.end = interned_dates.from_dict(end)
         self.validate_dates()
 
     def validate_dates(self):
@@ -1,8 +1,16 @@
 import json
+import sys
 from .timeline_component import TimelineComponent
 from .period import Period
 
+# Standard relationship types; a relationship stores the index of its standard type, or a custom type as is
+RELATIONSHIP_TYPES = ("CAUSE_EFFECT", "PRECEDES", "FOLLOWS", "CONTEMPORANEOUS", "INCLUDES", "EXCLUDES")
+TYPE_CODES = {relationship_type: code for code, relationship_type in enumerate(RELATIONSHIP_TYPES)}
+
+
 class Relationship:
+    __slots__ = ('id', 'from_component', 'to_component', '_type')
+
     STANDARD_TYPES = {
         "CAUSE_EFFECT", "CONTEMPORANEOUS", "PRECEDES", 
         "FOLLOWS", "INCLUDES", "EXCLUDES"
@@ -13,24 +21,25 @@ class Relationship:
         self.id = id
         self.from_component = from_component
         self.to_component = to_component
-        self._type = None
         self.type = relationship_type  # Using the setter
 
     @property
     def type(self) -> str:
-        return self._type
+        code = self._type
+        return RELATIONSHIP_TYPES[code] if code.__class__ is int else code
 
     @type.setter
     def type(self, value: str):
         # Clean up the value
         clean_value = value.upper().replace("-", "_")
         
-        # If it's a standard type, validate it
-        if clean_value in self.STANDARD_TYPES:
-            self._type = clean_value
+        # If it's a standard type, store its code
+        code = TYPE_CODES.get(clean_value)
+        if code is not None:
+            self._type = code
         else:
-            # For custom types, store the original value (not uppercased)
-            self._type = value
+            # For custom types, store the original value (not uppercased), shared between relationships
+            self._type = sys.intern(value) if value.__class__ is str else value
 
     def validate_relationship(self):
         # Only validate INCLUDES relationship type
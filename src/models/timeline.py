@@ -1,14 +1,13 @@
+import hashlib
 import json
 from typing import List, Dict
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-import numpy as np
 from collections import defaultdict
 from .timeline_component import TimelineComponent
 from .event import Event
 from .period import Period
 from .relationship import Relationship
-from .date import Date
+from .date import interned_dates
+from ..timings import phase, timed
 import os
 from io import BytesIO
 
@@ -23,6 +22,7 @@ class Timeline:
         self.components = components
         self.validate_components()
 
+    @timed('validate')
     def validate_components(self):
         if not self.components:
             raise ValueError("Timeline must have at least one component")
@@ -55,73 +55,85 @@ class Timeline:
             rel.from_component = from_comp
             rel.to_component = to_comp
 
-            # Validate temporal constraints based on relationship type
-            if rel.type == "CAUSE_EFFECT":
-                # For cause-effect, 'from' must be chronologically earlier than 'to'
-                if isinstance(from_comp, Event) and isinstance(to_comp, Event):
-                    if not (from_comp.date < to_comp.date):
-                        raise ValueError(f"Relationship {rel.id}: In a cause-effect relationship, the cause ({from_comp.id}) must be earlier than the effect ({to_comp.id})")
-                elif isinstance(from_comp, Period) and isinstance(to_comp, (Event, Period)):
-                    if isinstance(to_comp, Event):
-                        if not (from_comp.start < to_comp.date):
-                            raise ValueError(f"Relationship {rel.id}: In a cause-effect relationship, the cause period ({from_comp.id}) must start before the effect ({to_comp.id})")
-                    else:  # to_comp is Period
-                        if not (from_comp.start < to_comp.start):
-                            raise ValueError(f"Relationship {rel.id}: In a cause-effect relationship, the cause period ({from_comp.id}) must start before the effect period ({to_comp.id})")
-                elif isinstance(from_comp, Event) and isinstance(to_comp, Period):
-                    if not (from_comp.date < to_comp.end):
-                        raise ValueError(f"Relationship {rel.id}: In a cause-effect relationship, the cause ({from_comp.id}) must be earlier than the end of the effect period ({to_comp.id})")
-
-            elif rel.type == "PRECEDES":
-                # For precedes, 'from' must end before 'to' starts
-                from_date = from_comp.date if isinstance(from_comp, Event) else from_comp.end
-                to_date = to_comp.date if isinstance(to_comp, Event) else to_comp.start
-                if not (from_date < to_date):
-                    raise ValueError(f"Relationship {rel.id}: In a precedes relationship, {from_comp.id} must be before {to_comp.id}")
-
-            elif rel.type == "FOLLOWS":
-                # For follows, 'to' must end before 'from' starts
-                from_date = from_comp.date if isinstance(from_comp, Event) else from_comp.start
-                to_date = to_comp.date if isinstance(to_comp, Event) else to_comp.end
-                if not (to_date < from_date):
-                    raise ValueError(f"Relationship {rel.id}: In a follows relationship, {to_comp.id} must be before {from_comp.id}")
-
-            elif rel.type == "CONTEMPORANEOUS":
-                # For contemporaneous, components must overlap in time
-                if isinstance(from_comp, Event) and isinstance(to_comp, Event):
-                    if from_comp.date != to_comp.date:
-                        raise ValueError(f"Relationship {rel.id}: In a contemporaneous relationship between events, {from_comp.id} and {to_comp.id} must occur at the same time")
-                elif isinstance(from_comp, Period) and isinstance(to_comp, Period):
-                    if not (from_comp.start <= to_comp.end and to_comp.start <= from_comp.end):
-                        raise ValueError(f"Relationship {rel.id}: In a contemporaneous relationship between periods, {from_comp.id} and {to_comp.id} must overlap")
-                else:  # One is Event, one is Period
-                    event = from_comp if isinstance(from_comp, Event) else to_comp
-                    period = to_comp if isinstance(to_comp, Period) else from_comp
-                    if not (period.start <= event.date <= period.end):
-                        raise ValueError(f"Relationship {rel.id}: In a contemporaneous relationship, event {event.id} must occur during period {period.id}")
-
-            elif rel.type == "INCLUDES":
-                # Already validated in Relationship class that 'from' is a Period
+            self._validate_relationship(rel)
+
+    @timed('validate')
+    def validate_relationship(self, rel):
+        """Re-check the temporal constraints of a relationship validate_components already accepted as a member"""
+        self._validate_relationship(rel)
+
+    def _validate_relationship(self, rel):
+        from_comp = rel.from_component
+        to_comp = rel.to_component
+        rel_type = rel.type
+
+        # Validate temporal constraints based on relationship type
+        if rel_type == "CAUSE_EFFECT":
+            # For cause-effect, 'from' must be chronologically earlier than 'to'
+            if isinstance(from_comp, Event) and isinstance(to_comp, Event):
+                if not (from_comp.date < to_comp.date):
+                    raise ValueError(f"Relationship {rel.id}: In a cause-effect relationship, the cause ({from_comp.id}) must be earlier than the effect ({to_comp.id})")
+            elif isinstance(from_comp, Period) and isinstance(to_comp, (Event, Period)):
                 if isinstance(to_comp, Event):
-                    if not (from_comp.start <= to_comp.date <= from_comp.end):
-                        raise ValueError(f"Relationship {rel.id}: In an includes relationship, event {to_comp.id} must occur within period {from_comp.id}")
+                    if not (from_comp.start < to_comp.date):
+                        raise ValueError(f"Relationship {rel.id}: In a cause-effect relationship, the cause period ({from_comp.id}) must start before the effect ({to_comp.id})")
                 else:  # to_comp is Period
-                    if not (from_comp.start <= to_comp.start and to_comp.end <= from_comp.end):
-                        raise ValueError(f"Relationship {rel.id}: In an includes relationship, period {to_comp.id} must be entirely within period {from_comp.id}")
-
-            elif rel.type == "EXCLUDES":
-                if isinstance(from_comp, Period) and isinstance(to_comp, Period):
-                    if from_comp.start <= to_comp.end and to_comp.start <= from_comp.end:
-                        raise ValueError(f"Relationship {rel.id}: In an excludes relationship, periods {from_comp.id} and {to_comp.id} must not overlap")
-                elif isinstance(from_comp, Period):
-                    if from_comp.start <= to_comp.date <= from_comp.end:
-                        raise ValueError(f"Relationship {rel.id}: In an excludes relationship, event {to_comp.id} must not occur during period {from_comp.id}")
-                elif isinstance(to_comp, Period):
-                    if to_comp.start <= from_comp.date <= to_comp.end:
-                        raise ValueError(f"Relationship {rel.id}: In an excludes relationship, event {from_comp.id} must not occur during period {to_comp.id}")
-                else:  # Both are events
-                    if from_comp.date == to_comp.date:
-                        raise ValueError(f"Relationship {rel.id}: In an excludes relationship, events {from_comp.id} and {to_comp.id} must not occur at the same time") 
+                    if not (from_comp.start < to_comp.start):
+                        raise ValueError(f"Relationship {rel.id}: In a cause-effect relationship, the cause period ({from_comp.id}) must start before the effect period ({to_comp.id})")
+            elif isinstance(from_comp, Event) and isinstance(to_comp, Period):
+                if not (from_comp.date < to_comp.end):
+                    raise ValueError(f"Relationship {rel.id}: In a cause-effect relationship, the cause ({from_comp.id}) must be earlier than the end of the effect period ({to_comp.id})")
+
+        elif rel_type == "PRECEDES":
+            # For precedes, 'from' must end before 'to' starts
+            from_date = from_comp.date if isinstance(from_comp, Event) else from_comp.end
+            to_date = to_comp.date if isinstance(to_comp, Event) else to_comp.start
+            if not (from_date < to_date):
+                raise ValueError(f"Relationship {rel.id}: In a precedes relationship, {from_comp.id} must be before {to_comp.id}")
+
+        elif rel_type == "FOLLOWS":
+            # For follows, 'to' must end before 'from' starts
+            from_date = from_comp.date if isinstance(from_comp, Event) else from_comp.start
+            to_date = to_comp.date if isinstance(to_comp, Event) else to_comp.end
+            if not (to_date < from_date):
+                raise ValueError(f"Relationship {rel.id}: In a follows relationship, {to_comp.id} must be before {from_comp.id}")
+
+        elif rel_type == "CONTEMPORANEOUS":
+            # For contemporaneous, components must overlap in time
+            if isinstance(from_comp, Event) and isinstance(to_comp, Event):
+                if from_comp.date != to_comp.date:
+                    raise ValueError(f"Relationship {rel.id}: In a contemporaneous relationship between events, {from_comp.id} and {to_comp.id} must occur at the same time")
+            elif isinstance(from_comp, Period) and isinstance(to_comp, Period):
+                if not (from_comp.start <= to_comp.end and to_comp.start <= from_comp.end):
+                    raise ValueError(f"Relationship {rel.id}: In a contemporaneous relationship between periods, {from_comp.id} and {to_comp.id} must overlap")
+            else:  # One is Event, one is Period
+                event = from_comp if isinstance(from_comp, Event) else to_comp
+                period = to_comp if isinstance(to_comp, Period) else from_comp
+                if not (period.start <= event.date <= period.end):
+                    raise ValueError(f"Relationship {rel.id}: In a contemporaneous relationship, event {event.id} must occur during period {period.id}")
+
+        elif rel_type == "INCLUDES":
+            # Already validated in Relationship class that 'from' is a Period
+            if isinstance(to_comp, Event):
+                if not (from_comp.start <= to_comp.date <= from_comp.end):
+                    raise ValueError(f"Relationship {rel.id}: In an includes relationship, event {to_comp.id} must occur within period {from_comp.id}")
+            else:  # to_comp is Period
+                if not (from_comp.start <= to_comp.start and to_comp.end <= from_comp.end):
+                    raise ValueError(f"Relationship {rel.id}: In an includes relationship, period {to_comp.id} must be entirely within period {from_comp.id}")
+
+        elif rel_type == "EXCLUDES":
+            if isinstance(from_comp, Period) and isinstance(to_comp, Period):
+                if from_comp.start <= to_comp.end and to_comp.start <= from_comp.end:
+                    raise ValueError(f"Relationship {rel.id}: In an excludes relationship, periods {from_comp.id} and {to_comp.id} must not overlap")
+            elif isinstance(from_comp, Period):
+                if from_comp.start <= to_comp.date <= from_comp.end:
+                    raise ValueError(f"Relationship {rel.id}: In an excludes relationship, event {to_comp.id} must not occur during period {from_comp.id}")
+            elif isinstance(to_comp, Period):
+                if to_comp.start <= from_comp.date <= to_comp.end:
+                    raise ValueError(f"Relationship {rel.id}: In an excludes relationship, event {from_comp.id} must not occur during period {to_comp.id}")
+            else:  # Both are events
+                if from_comp.date == to_comp.date:
+                    raise ValueError(f"Relationship {rel.id}: In an excludes relationship, events {from_comp.id} and {to_comp.id} must not occur at the same time")
 
     def _date_to_decimal(self, date):
         """Convert a Date object to a decimal year for precise positioning"""
@@ -133,15 +145,6 @@ class Timeline:
                 year += (date.day - 1) / (days_in_month * 12)
         return year
 
-    def _get_date_range(self):
-        dates = []
-        for comp in self.components:
-            if isinstance(comp, Event):
-                dates.append(comp.date)
-            elif isinstance(comp, Period):
-                dates.extend([comp.start, comp.end])
-        return min(dates), max(dates)
-
     def _calculate_tick_interval(self, min_date, max_date):
         """Calculate appropriate tick interval based on date range to maintain 10-15 ticks"""
         total_span = self._date_to_decimal(max_date) - self._date_to_decimal(min_date)
@@ -285,19 +288,19 @@ class Timeline:
             # Generate daily ticks
             # Calculate the first tick before min_date
             step = 1 if interval_type == "days_dense" else 2
-            current = Date({"year": min_date.year, "month": min_date.month, "day": min_date.day})
+            current = interned_dates.get(min_date.year, min_date.month, min_date.day)
             
             # Move back to find the previous tick
             for _ in range(step):
                 if current.day > 1:
-                    current = Date({"year": current.year, "month": current.month, "day": current.day - 1})
+                    current = interned_dates.get(current.year, current.month, current.day - 1)
                 else:
                     if current.month == 1:
-                        current = Date({"year": current.year - 1, "month": 12, "day": 31})
+                        current = interned_dates.get(current.year - 1, 12, 31)
                     else:
                         prev_month = current.month - 1
                         days_in_prev_month = current._days_in_month(current.year, prev_month)
-                        current = Date({"year": current.year, "month": prev_month, "day": days_in_prev_month})
+                        current = interned_dates.get(current.year, prev_month, days_in_prev_month)
             
             # Generate ticks including one before and after
             while current <= max_date or self._date_to_decimal(current) <= end_year + step/365:
@@ -312,27 +315,27 @@ class Timeline:
                 # Move to next day(s)
                 for _ in range(step):
                     if current.day < current._days_in_month(current.year, current.month):
-                        current = Date({"year": current.year, "month": current.month, "day": current.day + 1})
+                        current = interned_dates.get(current.year, current.month, current.day + 1)
                     else:
                         if current.month == 12:
-                            current = Date({"year": current.year + 1, "month": 1, "day": 1})
+                            current = interned_dates.get(current.year + 1, 1, 1)
                         else:
-                            current = Date({"year": current.year, "month": current.month + 1, "day": 1})
+                            current = interned_dates.get(current.year, current.month + 1, 1)
                             
         elif interval_type == "weeks":
             # Generate weekly ticks
             # Start from a week before
-            current = Date({"year": min_date.year, "month": min_date.month, "day": min_date.day})
+            current = interned_dates.get(min_date.year, min_date.month, min_date.day)
             for _ in range(7):  # Go back one week
                 if current.day > 1:
-                    current = Date({"year": current.year, "month": current.month, "day": current.day - 1})
+                    current = interned_dates.get(current.year, current.month, current.day - 1)
                 else:
                     if current.month == 1:
-                        current = Date({"year": current.year - 1, "month": 12, "day": 31})
+                        current = interned_dates.get(current.year - 1, 12, 31)
                     else:
                         prev_month = current.month - 1
                         days_in_prev_month = current._days_in_month(current.year, prev_month)
-                        current = Date({"year": current.year, "month": prev_month, "day": days_in_prev_month})
+                        current = interned_dates.get(current.year, prev_month, days_in_prev_month)
             
             # Generate ticks including one before and after
             while current <= max_date or self._date_to_decimal(current) <= end_year + 7/365:
@@ -343,20 +346,20 @@ class Timeline:
                 # Move to next week
                 for _ in range(7):
                     if current.day < current._days_in_month(current.year, current.month):
-                        current = Date({"year": current.year, "month": current.month, "day": current.day + 1})
+                        current = interned_dates.get(current.year, current.month, current.day + 1)
                     else:
                         if current.month == 12:
-                            current = Date({"year": current.year + 1, "month": 1, "day": 1})
+                            current = interned_dates.get(current.year + 1, 1, 1)
                         else:
-                            current = Date({"year": current.year, "month": current.month + 1, "day": 1})
+                            current = interned_dates.get(current.year, current.month + 1, 1)
                             
         elif interval_type in ["months", "months_dense", "months_selective"]:
             # Calculate the first tick before min_date
-            current = Date({"year": min_date.year, "month": min_date.month})
+            current = interned_dates.get(min_date.year, min_date.month)
             if current.month == 1:
-                current = Date({"year": current.year - 1, "month": 12})
+                current = interned_dates.get(current.year - 1, 12)
             else:
-                current = Date({"year": current.year, "month": current.month - 1})
+                current = interned_dates.get(current.year, current.month - 1)
             
             # Generate ticks including one before and after
             while current <= max_date or (current.month == max_date.month + 1 and current.year == max_date.year):
@@ -375,9 +378,9 @@ class Timeline:
                     ticks.append((pos, label))
                   # Move to next month
                 if current.month == 12:
-                    current = Date({"year": current.year + 1, "month": 1})
+                    current = interned_dates.get(current.year + 1, 1)
                 else:
-                    current = Date({"year": current.year, "month": current.month + 1})
+                    current = interned_dates.get(current.year, current.month + 1)
                     
         elif interval_type.startswith("years"):
             # Extract step size from interval type
@@ -449,17 +452,10 @@ class Timeline:
                 
         return ticks
 
-    def _calculate_levels(self, components, axis_length):
-        # Filter out relationships, only handle events and periods
-        event_period_comps = [comp for comp in components if isinstance(comp, (Event, Period))]
-        
-        # Sort components by date
-        sorted_comps = sorted(
-            event_period_comps,
-            key=lambda x: (x.date.year if isinstance(x, Event) else x.start.year,
-                         x.date.month if isinstance(x, Event) and x.date.month else 0,
-                         x.date.day if isinstance(x, Event) and x.date.day else 0)
-        )
+    @timed('layout')
+    def _calculate_levels(self, store, axis_length):
+        # Sort events and periods by date
+        sorted_comps = store.level_order()
 
         # Initialize levels dictionary
         levels = {}
@@ -536,9 +532,10 @@ class Timeline:
 
         return levels
 
-    def _calculate_period_positions(self, periods):
+    @timed('layout')
+    def _calculate_period_positions(self, store):
         # Sort periods by start date
-        sorted_periods = sorted(periods, key=lambda p: (p.start.year, p.end.year))
+        sorted_periods = store.period_order()
         
         # Track period vertical positions
         period_positions = {}
@@ -562,6 +559,8 @@ class Timeline:
         return period_positions
 
     def _get_arc_midpoint(self, ax, p1, p2, rad):
+        import matplotlib.patches as patches
+
         patch = patches.FancyArrowPatch(
             p1, p2,
             connectionstyle=f"arc3,rad={rad}",
@@ -583,13 +582,26 @@ class Timeline:
         mid_idx = len(points) // 2
         return points[mid_idx]
 
+    @timed('draw')
     def generate_png_bytes(self) -> bytes:
         """Generate the timeline visualization and return it as bytes."""
+        # The plotting stack is imported here rather than at module level so that
+        # parsing and interpreting never pay for loading matplotlib and numpy
+        import matplotlib.pyplot as plt
+        import matplotlib.patches as patches
+        import numpy as np
+        from .component_store import ComponentStore
+
         # Create figure with extra space at bottom for legend
         fig, ax = plt.subplots(figsize=(15, 10), layout='constrained')
+
+        # Separate components by type
+        events_and_periods = [comp for comp in self.components if isinstance(comp, (Event, Period))]
+        relationships = [comp for comp in self.components if isinstance(comp, Relationship)]
+        store = ComponentStore(events_and_periods)
         
         # Get date range and convert to decimal years for precise positioning
-        min_date, max_date = self._get_date_range()
+        min_date, max_date = store.date_range()
         
         # Calculate tick interval based on the actual data range
         interval_type = self._calculate_tick_interval(min_date, max_date)
@@ -600,17 +612,12 @@ class Timeline:
         if xlim_max != xlim_min:
             ax.set_xlim(xlim_min, xlim_max + 0.02 * axis_length)
 
-        # Separate components by type
-        events_and_periods = [comp for comp in self.components if isinstance(comp, (Event, Period))]
-        relationships = [comp for comp in self.components if isinstance(comp, Relationship)]
-
         # Calculate levels for events and periods
-        levels = self._calculate_levels(events_and_periods, axis_length)
+        levels = self._calculate_levels(store, axis_length)
         min_y, max_y = min(levels.values()), max(levels.values())
         ax.set_ylim(min(-3, min_y), max(3, max_y))
-        # Get periods and calculate their positions
-        periods = [comp for comp in events_and_periods if isinstance(comp, Period)]
-        period_positions = self._calculate_period_positions(periods)
+        # Calculate the positions of the period bars
+        period_positions = self._calculate_period_positions(store)
 
         # Draw main axis with arrowhead
         ax.axhline(0, color='black', linewidth=1.5, zorder=1)
@@ -633,8 +640,8 @@ class Timeline:
         )
 
         # Create temporary Date objects for the extended range
-        extended_min_date = Date({"year": int(xlim_min), "month": 1, "day": 1})
-        extended_max_date = Date({"year": int(xlim_max + 1), "month": 12, "day": 31})
+        extended_min_date = interned_dates.get(int(xlim_min), 1, 1)
+        extended_max_date = interned_dates.get(int(xlim_max + 1), 12, 31)
         
         # Generate and add tick marks with the extended range
         ticks = self._generate_ticks(extended_min_date, extended_max_date, interval_type)
@@ -659,13 +666,7 @@ class Timeline:
                           zorder=1)
 
         # Sort components for drawing
-        sorted_components = sorted(
-            events_and_periods,
-            key=lambda x: (
-                self._date_to_decimal(x.date if isinstance(x, Event) else x.start),
-                -["HIGH", "MEDIUM", "LOW"].index(x.importance)
-            )
-        )
+        sorted_components = store.drawing_order()
 
         # Group components by importance
         importance_groups = {
@@ -707,7 +708,7 @@ class Timeline:
             if isinstance(component, Event):
                 level = levels[component]
                 # Convert date to decimal for precise positioning
-                pos = self._date_to_decimal(component.date)
+                pos = store.position(component)
                 
                 # Draw vertical line (stem)
                 ax.vlines(pos, 0, level, color=color, linewidth=1.5, zorder=2)
@@ -749,8 +750,7 @@ class Timeline:
                 period_height = 0.15
                 
                 # Convert dates to decimal for precise positioning
-                start_pos = self._date_to_decimal(component.start)
-                end_pos = self._date_to_decimal(component.end)
+                start_pos, end_pos = store.span(component)
                 
                 # Draw period bar above the axis
                 rect = patches.Rectangle(
@@ -802,24 +802,22 @@ class Timeline:
         for rel in relationships:
             # Get positions for the relationship line
             if isinstance(rel.from_component, Event):
-                from_pos = self._date_to_decimal(rel.from_component.date)
                 from_y = levels[rel.from_component]
+                from_pos = store.position(rel.from_component)
             else:  # Period
                 # Use the middle of the period for the x-position
-                start_pos = self._date_to_decimal(rel.from_component.start)
-                end_pos = self._date_to_decimal(rel.from_component.end)
-                from_pos = (start_pos + end_pos) / 2
                 from_y = levels[rel.from_component]
+                start_pos, end_pos = store.span(rel.from_component)
+                from_pos = (start_pos + end_pos) / 2
 
             if isinstance(rel.to_component, Event):
-                to_pos = self._date_to_decimal(rel.to_component.date)
                 to_y = levels[rel.to_component]
+                to_pos = store.position(rel.to_component)
             else:  # Period
                 # Use the middle of the period for the x-position
-                start_pos = self._date_to_decimal(rel.to_component.start)
-                end_pos = self._date_to_decimal(rel.to_component.end)
-                to_pos = (start_pos + end_pos) / 2
                 to_y = levels[rel.to_component]
+                start_pos, end_pos = store.span(rel.to_component)
+                to_pos = (start_pos + end_pos) / 2
 
             # Draw relationship line with arrow
             arrow_style = {
@@ -932,11 +930,27 @@ class Timeline:
 
         # Save to bytes buffer instead of file
         buf = BytesIO()
-        plt.savefig(buf, format='png', dpi=300, bbox_inches='tight')
+        with phase('savefig'):
+            plt.savefig(buf, format='png', dpi=300, bbox_inches='tight')
         plt.close()
         buf.seek(0)
         return buf.getvalue()
 
+    def fingerprint(self) -> str:
+        """Hash of everything generate_png_bytes draws, so equal fingerprints give identical PNGs."""
+        def date_key(date):
+            return (date.year, date.month, date.day)
+
+        parts = [self.title]
+        for comp in self.components:
+            if isinstance(comp, Event):
+                parts.append(('event', comp.id, comp.title, date_key(comp.date), comp.importance))
+            elif isinstance(comp, Period):
+                parts.append(('period', comp.id, comp.title, date_key(comp.start), date_key(comp.end), comp.importance))
+            elif isinstance(comp, Relationship):
+                parts.append(('relationship', comp.id, comp.from_component.id, comp.to_component.id, comp.type))
+        return hashlib.sha256(repr(parts).encode('utf-8')).hexdigest()
+
     def generate_json(self) -> str:
         """Generate the timeline data as a JSON string."""
         return json.dumps(self.to_dict(), indent=2)
@@ -1,24 +1,33 @@
+# Importance levels, most important first; a component stores the index of its level
+IMPORTANCE_LEVELS = ("HIGH", "MEDIUM", "LOW")
+IMPORTANCE_CODES = {importance: code for code, importance in enumerate(IMPORTANCE_LEVELS)}
+
+
 class TimelineComponent:
+    __slots__ = ('id', 'title', '_importance')
+
     def __init__(self, id: str, title: str, importance: str = "MEDIUM"):
         self.id = id
         self.title = title
-        self._importance = None
         self.importance = importance  # Using the setter
 
     @property
     def importance(self) -> str:
-        return self._importance
+        return IMPORTANCE_LEVELS[self._importance]
 
     @importance.setter
     def importance(self, value: str):
-        valid_importance = ["HIGH", "MEDIUM", "LOW"]
-        if value.upper() not in valid_importance:
-            raise ValueError(f"Importance must be one of {valid_importance}")
-        self._importance = value.upper()
+        # Values are nearly always already upper-case, so try them as they are first
+        code = IMPORTANCE_CODES.get(value) if value.__class__ is str else None
+        if code is None:
+            code = IMPORTANCE_CODES.get(value.upper())
+            if code is None:
+                raise ValueError(f"Importance must be one of {list(IMPORTANCE_LEVELS)}")
+        self._importance = code
 
     def to_dict(self) -> dict:
         return {
             "id": self.id,
             "title": self.title,
             "importance": self.importance
-        } 
\ No newline at end of file
+        } 
@@ -0,0 +1,79 @@
+from antlr4 import PredictionMode
+from antlr4.error.ErrorListener import ErrorListener
+from antlr4.error.ErrorStrategy import BailErrorStrategy
+from antlr4.error.Errors import ParseCancellationException
+from src.TimelineLexer import TimelineLexer
+from src.TimelineParser import TimelineParser
+from src.fast_lexer import TimelineFastLexer
+
+LEXERS = {
+    'antlr': TimelineLexer,
+    'fast': TimelineFastLexer
+}
+
+
+class ErrorBudgetExceeded(Exception):
+    """Raised by TimelineErrorListener to abort lexing and parsing once max_errors are collected"""
+
+
+# Custom error listener to capture parser errors
+class TimelineErrorListener(ErrorListener):
+    def __init__(self, max_errors: int = None):
+        self.errors = []
+        self.max_errors = max_errors  # None or 0 collects every error
+
+    @property
+    def exhausted(self) -> bool:
+        return bool(self.max_errors) and len(self.errors) >= self.max_errors
+
+    def syntaxError(self, recognizer, offendingSymbol, line, column, msg, e):
+        error = {
+            'line': line,
+            'column': column,
+            'message': msg,
+            'symbol': offendingSymbol.text if offendingSymbol else None
+        }
+        self.errors.append(error)
+        if self.exhausted:
+            # Unwinds out of the lexer/parser; the caller reports the errors collected so far
+            raise ErrorBudgetExceeded(f"stopped after {len(self.errors)} errors")
+
+
+def create_lexer(input_stream, kind: str = 'antlr'):
+    """Create the lexer selected by kind ('antlr' for the generated lexer, 'fast' for the hand-written one)"""
+    if kind not in LEXERS:
+        raise ValueError(f"Unknown lexer '{kind}', expected one of {sorted(LEXERS)}")
+    return LEXERS[kind](input_stream)
+
+
+def parse_program(parser: TimelineParser, two_stage: bool = False):
+    """Parse a whole program, optionally trying the cheaper SLL prediction mode first.
+
+    In two-stage mode the first pass runs in SLL mode with a bail-out error strategy and
+    no error listeners attached. Only when that pass fails is the input rewound and
+    parsed again in full LL mode with the default error strategy, so any syntax errors
+    reach the parser's listeners exactly as in a plain LL parse.
+    """
+    if not two_stage:
+        return parser.program()
+
+    listeners = list(parser._listeners)
+    error_handler = parser._errHandler
+    parser.removeErrorListeners()
+    parser._interp.predictionMode = PredictionMode.SLL
+    parser._errHandler = BailErrorStrategy()
+    try:
+        tree = parser.program()
+    except ParseCancellationException:
+        tree = None
+
+    parser._interp.predictionMode = PredictionMode.LL
+    parser._errHandler = error_handler
+    for listener in listeners:
+        parser.addErrorListener(listener)
+
+    if tree is None:
+        # SLL failed (syntax error or a decision needing full context): rewind and parse in LL
+        parser.reset()
+        tree = parser.program()
+    return tree
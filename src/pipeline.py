@@ -0,0 +1,264 @@
+from antlr4 import InputStream, CommonTokenStream
+from src import compiled_cache
+from src.TimelineParser import TimelineParser
+from src.TimelineInterpreter import TimelineInterpreter, ValidationError
+from src.parsing import ErrorBudgetExceeded, TimelineErrorListener, create_lexer, parse_program
+from src.timings import phase, time_lexer
+
+
+def compile_timeline(timeline_code, lexer_kind='antlr', two_stage=False, incremental=None, max_errors=None,
+                     render=True, image_store=None, render_pool=None, render_cache=None, debug=False):
+    """Lex, parse and interpret the code, returning the /visualize response payload.
+
+    max_errors stops lexing and parsing once that many errors are collected (None for all).
+    With render=False the components are validated but not rendered, and the exported
+    components carry only their id, type and title. With an image_store, exported
+    timelines carry an image_handle into it instead of a rendered image; with a
+    render_pool they are rendered in its worker processes, and a render_cache reuses
+    PNGs of timelines rendered by earlier calls. debug adds the optimizer's report of
+    the code it removed from main.
+    """
+    if incremental is not None:
+        prepared = incremental.prepare(timeline_code, TimelineInterpreter(render=render, image_store=image_store,
+                                                                          render_pool=render_pool,
+                                                                          render_cache=render_cache))
+        if prepared is not None:
+            interpreter, main_block = prepared
+            if main_block is not None:
+                # Main may already have exported and rendered when it fails, so its errors are final
+                error_payload = run_interpreter(interpreter, lambda: interpreter.visit(main_block))
+                if error_payload:
+                    return error_payload
+            return export_payload(interpreter, debug)
+        # Fall through to the full parse, which reports any errors with exact positions
+
+    tree, error_payload = parse_timeline(timeline_code, lexer_kind, two_stage, max_errors=max_errors)
+    if error_payload:
+        return error_payload
+
+    # Run the interpreter
+    interpreter = TimelineInterpreter(render=render, image_store=image_store, render_pool=render_pool,
+                                      render_cache=render_cache)
+    error_payload = run_interpreter(interpreter, lambda: interpreter.visit(tree))
+    if error_payload:
+        return error_payload
+
+    return export_payload(interpreter, debug)
+
+
+def parse_timeline(timeline_code, lexer_kind='antlr', two_stage=False, rule='program', position=None,
+                   max_errors=None):
+    """Lex and parse the code with the given start rule, returning (tree, error payload or None).
+
+    position is the (line, column) at which the code starts in its file, for parsing a
+    slice of a larger source with error positions relative to the whole file. Lexing and
+    parsing stop as soon as the lexer or the parser has collected max_errors errors.
+    """
+    parser, lexer_error_listener, parser_error_listener = create_parser(timeline_code, lexer_kind, position,
+                                                                        max_errors)
+
+    # Check for lexer errors first
+    if lexer_error_listener.errors:
+        return None, lexer_error_payload(lexer_error_listener)
+
+    # Parse the input
+    try:
+        with phase('parser'):
+            if rule == 'program':
+                tree = parse_program(parser, two_stage=two_stage)
+            else:
+                tree = getattr(parser, rule)()
+    except ErrorBudgetExceeded:
+        tree = None
+
+    error_payload = parse_error_payload(lexer_error_listener, parser_error_listener)
+    if error_payload:
+        return None, error_payload
+    return tree, None
+
+
+def create_parser(timeline_code, lexer_kind='antlr', position=None, max_errors=None, parser=None):
+    """Set up the lexer and parser for the code, returning (parser, lexer listener, parser listener).
+
+    position is the (line, column) at which the code starts in its file. An existing
+    parser is pointed at the new tokens instead of building another one.
+    """
+    # Process the timeline code directly from memory
+    input_stream = InputStream(timeline_code)
+    lexer = create_lexer(input_stream, lexer_kind)
+    time_lexer(lexer)
+    if position is not None:
+        lexer.line, lexer.column = position
+    lexer_error_listener = TimelineErrorListener(max_errors)
+    lexer.removeErrorListeners()
+    lexer.addErrorListener(lexer_error_listener)
+    tokens = CommonTokenStream(lexer)
+    if parser is None:
+        parser = TimelineParser(tokens)
+    else:
+        parser.setTokenStream(tokens)
+    parser_error_listener = TimelineErrorListener(max_errors)
+    parser.removeErrorListeners()
+    parser.addErrorListener(parser_error_listener)
+    return parser, lexer_error_listener, parser_error_listener
+
+
+def parse_error_payload(lexer_error_listener, parser_error_listener):
+    """Return the error payload for the errors collected while parsing, or None"""
+    # Lexing is interleaved with parsing, so the lexer may have used up the budget
+    if lexer_error_listener.exhausted:
+        return lexer_error_payload(lexer_error_listener)
+
+    # Check for parser errors
+    if parser_error_listener.errors:
+        return {
+            'success': False,
+            'error': 'Syntax Errors:',
+            'parser_errors': parser_error_listener.errors,
+            'error_type': 'parser_error'
+        }
+    return None
+
+
+def lexer_error_payload(lexer_error_listener):
+    return {
+        'success': False,
+        'error': 'Lexical Errors:',
+        'parser_errors': lexer_error_listener.errors,
+        'error_type': 'lexer_error'
+    }
+
+
+def compile_file(path, lexer_kind='antlr', two_stage=False, run_main=True, max_errors=None, render_pool=None,
+                 debug=False):
+    """Compile a .timeline file using its on-disk compiled cache, returning the /visualize response payload.
+
+    When the cache next to the file matches the source and grammar, the declared
+    components are loaded from it and only the main block is parsed. Otherwise the
+    whole file is parsed, the declarations are interpreted and their state is written
+    to the cache before main runs. With run_main=False only the cache is brought up to
+    date and the payload has no components.
+    """
+    with open(path, encoding='utf-8') as f:
+        code = f.read()
+
+    interpreter = TimelineInterpreter(render_pool=render_pool)
+    cached = compiled_cache.load(path, code)
+    if cached is not None:
+        tables, main_position = cached
+        interpreter.load_symbol_tables(tables)
+        main_block = None
+        if run_main and main_position is not None:
+            index, line, column = main_position
+            main_block, error_payload = parse_timeline(code[index:], lexer_kind, rule='mainBlock', position=(line, column))
+            if error_payload:
+                return error_payload
+    else:
+        tree, error_payload = parse_timeline(code, lexer_kind, two_stage, max_errors=max_errors)
+        if error_payload:
+            return error_payload
+        error_payload = run_interpreter(interpreter, lambda: [interpreter.visit(d) for d in tree.declaration()])
+        if error_payload:
+            return error_payload
+
+        main_block = tree.mainBlock()
+        main_position = None
+        if main_block is not None:
+            main_position = (main_block.start.start, main_block.start.line, main_block.start.column)
+        try:
+            compiled_cache.save(path, code, interpreter.symbol_tables(), main_position)
+        except OSError as e:
+            print(f"[Info] Could not write compiled cache for {path}: {e}")
+
+    if not run_main:
+        return {'success': True, 'components': []}
+    if main_block is not None:
+        error_payload = run_interpreter(interpreter, lambda: interpreter.visit(main_block))
+        if error_payload:
+            return error_payload
+    return export_payload(interpreter, debug)
+
+
+def stream_timeline(stream, lexer_kind='antlr', max_errors=None, image_store=None, render_pool=None,
+                    render_cache=None):
+    """Parse and interpret a text stream one declaration at a time, returning the /visualize response payload"""
+    from src.streaming import StreamingFrontend  # imports incremental, which imports this module
+
+    frontend = StreamingFrontend(lexer=lexer_kind, max_errors=max_errors)
+    interpreter = TimelineInterpreter(image_store=image_store, render_pool=render_pool, render_cache=render_cache)
+    error_payload = run_interpreter(interpreter, lambda: frontend.run(stream, interpreter))
+    if error_payload:
+        return error_payload
+
+    if frontend.error_payload:
+        return frontend.error_payload
+
+    return export_payload(interpreter)
+
+
+def run_interpreter(interpreter, run):
+    """Call run(), turning interpreter exceptions into the matching error payload (None on success)"""
+    try:
+        with phase('interpreter'):
+            run()
+    except ValidationError as e:
+        # Return the validation error with line and column information
+        print(f"Validation error at line {e.line}, column {e.column}: {str(e)}")
+        return {
+            'success': False,
+            'error': 'Validation Error:',
+            'validation_errors': interpreter.interpretation_errors,
+            'error_type': 'validation_error'
+        }
+    except NameError as e:
+        print(e)
+        return {
+            'success': False,
+            'error': 'Name Error:',
+            'name_errors': interpreter.interpretation_errors,
+            'error_type': 'name_error'
+        }
+    except LookupError as e:
+        print(e)
+        return {
+            'success': False,
+            'error': 'Lookup Error:',
+            'lookup_errors': interpreter.interpretation_errors,
+            'error_type': 'lookup_error'
+        }
+    except TypeError as e:
+        print(e)
+        return {
+            'success': False,
+            'error': 'Type Error:',
+            'type_errors': interpreter.interpretation_errors,
+            'error_type': 'type_error'
+        }
+    except AttributeError as e:
+        print(e)
+        return {
+            'success': False,
+            'error': 'Type Error:',
+            'attribute_errors': interpreter.interpretation_errors,
+            'error_type': 'attribute_error'
+        }
+    return None
+
+
+def export_payload(interpreter, debug=False):
+    """Build the /visualize payload from an interpreter that ran without errors"""
+    if not interpreter.exported_components:
+        return {
+            'success': False,
+            'error': 'No timeline was exported. Add an export command in the main block to visualize the timeline.',
+            'error_type': 'export_missing'
+        }
+
+    # Return the components that were rendered by the interpreter
+    payload = {
+        'success': True,
+        'components': interpreter.exported_components
+    }
+    if debug:
+        payload['optimizer'] = {'removed': interpreter.optimizer_report}
+    return payload
@@ -0,0 +1,75 @@
+from src.models import Event, Period, Relationship
+from src.symbol_table import RELATIONSHIP, TIMELINE
+
+# Properties the temporal constraints of a relationship are computed from
+CONSTRAINED_PROPERTIES = frozenset(('date', 'start', 'end', 'type'))
+
+
+class ReferenceIndex:
+    """Reverse index from each component to the relationships and timelines that reference it.
+
+    Every timeline has been validated when it was declared, and only a modify can break
+    one of its relationships afterwards. A modify of a property the constraints depend
+    on marks the relationships it touches as stale in each timeline holding them, and
+    revalidate(timeline) re-checks just those, in the timeline's order, so it fails on
+    the same relationship (with the same message) as a full validate_components().
+    """
+
+    def __init__(self, symbols):
+        self._relationships = {}  # id(event or period) -> relationships using it as from or to
+        self._timelines = {}  # id(relationship) -> (timeline, position) per timeline holding it
+        self._stale = {}  # id(timeline) -> {position: relationship} to re-check
+        # validate_components() points each relationship at the from/to components of the
+        # timeline being validated. A relationship shared by timelines holding different
+        # components under the same id (a redeclared event, say) is moved back and forth,
+        # so revalidate() repeats that for it: id(timeline) -> {position: (relationship, from, to)}
+        self._rewired = {}
+
+        for rel in symbols.view(RELATIONSHIP).values():
+            self._reference(rel, rel.from_component, rel.to_component)
+        endpoints = {}  # id(relationship) -> [(timeline, position, relationship, from, to)]
+        for timeline in symbols.view(TIMELINE).values():
+            components = {component.id: component for component in timeline.components
+                          if isinstance(component, (Event, Period))}
+            for position, component in enumerate(timeline.components):
+                if isinstance(component, Relationship):
+                    self._timelines.setdefault(id(component), []).append((timeline, position))
+                    from_comp = components[component.from_component.id]
+                    to_comp = components[component.to_component.id]
+                    endpoints.setdefault(id(component), []).append((timeline, position, component, from_comp, to_comp))
+        for held in endpoints.values():
+            if len({(id(from_comp), id(to_comp)) for *_, from_comp, to_comp in held}) > 1:
+                for timeline, position, rel, from_comp, to_comp in held:
+                    self._reference(rel, from_comp, to_comp)
+                    self._rewired.setdefault(id(timeline), {})[position] = (rel, from_comp, to_comp)
+
+    def _reference(self, rel, *components):
+        for component in {id(component): component for component in components}.values():
+            references = self._relationships.setdefault(id(component), [])
+            if rel not in references:
+                references.append(rel)
+
+    def modified(self, component, props):
+        """Record that props of component were assigned"""
+        if CONSTRAINED_PROPERTIES.isdisjoint(props):
+            return
+        if isinstance(component, Relationship):
+            affected = (component,)
+        else:
+            affected = self._relationships.get(id(component), ())
+        for rel in affected:
+            for timeline, position in self._timelines.get(id(rel), ()):
+                self._stale.setdefault(id(timeline), {})[position] = rel
+
+    def revalidate(self, timeline):
+        """Re-check the relationships of timeline that changed since it was last validated"""
+        rewired = self._rewired.get(id(timeline), {})
+        stale = self._stale.pop(id(timeline), {})
+        # Same order as validate_components(), which stops moving relationships at the first failure
+        for position in sorted(rewired.keys() | stale.keys()):
+            if position in rewired:
+                rel, from_comp, to_comp = rewired[position]
+                rel.from_component = from_comp
+                rel.to_component = to_comp
+            if position in stale:
+                timeline.validate_relationship(stale[position])
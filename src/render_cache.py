@@ -0,0 +1,11 @@
+from src.lru_cache import LRUCache
+
+
+class RenderCache(LRUCache):
+    """Bounded LRU cache of rendered timeline PNGs shared across requests, keyed by Timeline.fingerprint()."""
+
+    def __init__(self, max_size: int = 64):
+        super().__init__(max_size)  # fingerprint -> PNG bytes
+
+    def _extra_stats(self) -> dict:
+        return {'bytes': sum(len(png) for png in self._entries.values())}
@@ -0,0 +1,50 @@
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+
+
+def _init_worker():
+    """Load matplotlib and its fonts in a new worker by rendering a tiny timeline once"""
+    os.environ.setdefault('MPLBACKEND', 'Agg')
+    from src.models import Event, Timeline
+    Timeline('warmup', 'Warm-up', [Event('warmup', 'Warm-up', {'year': 2000})]).generate_png_bytes()
+
+
+def _ready():
+    return os.getpid()
+
+
+def _render_snapshot(snapshot: bytes) -> bytes:
+    return pickle.loads(snapshot).generate_png_bytes()
+
+
+class RenderPool:
+    """Pool of worker processes that render timeline PNGs in parallel.
+
+    Each worker imports matplotlib and renders a warm-up timeline when it starts, and
+    warm() starts all of them ahead of the first request. Timelines are pickled when
+    submitted, so a later modify of the same components cannot change what is drawn.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+
+    def warm(self) -> float:
+        """Start every worker and wait until all are ready, returning the time it took in seconds"""
+        start = time.perf_counter()
+        # Submitting one task per worker before any completes makes the executor start them all
+        wait([self._executor.submit(_ready) for _ in range(self.workers)])
+        return time.perf_counter() - start
+
+    def submit(self, timeline):
+        """Queue a render of timeline, returning a Future for its PNG bytes"""
+        return self.submit_snapshot(pickle.dumps(timeline, protocol=pickle.HIGHEST_PROTOCOL))
+
+    def submit_snapshot(self, snapshot: bytes):
+        """Queue a render of an already pickled timeline, returning a Future for its PNG bytes"""
+        return self._executor.submit(_render_snapshot, snapshot)
+
+    def shutdown(self):
+        self._executor.shutdown(cancel_futures=True)
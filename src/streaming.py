@@ -0,0 +1,128 @@
+from src.TimelineParser import TimelineParser
+from src.TimelineInterpreter import TimelineInterpreter
+from src.incremental import BLOCK_SCAN, TRAILING_TRIVIA
+from src.parsing import ErrorBudgetExceeded
+from src.pipeline import create_parser, parse_error_payload
+
+
+def iter_blocks(stream, block_size: int = 1 << 16):
+    """Yield (text, line, column) for each top-level block read from a text stream.
+
+    Only the block being assembled is held in memory. line and column give the position
+    of the first character of text in the whole source. Whatever follows the last
+    complete block (normally just whitespace and comments) is yielded last.
+    """
+    buffer = ''
+    scan = 0
+    depth = 0
+    line, column = 1, 0
+    at_eof = False
+    while True:
+        match = BLOCK_SCAN.search(buffer, scan)
+        # A string or comment touching the end of the buffer may continue in the next read
+        if match is None or (not at_eof and match.end() == len(buffer) and match.group()[0] in '"/'):
+            if at_eof:
+                break
+            if match is None:
+                # Keep a trailing '/' in view in case it starts a comment
+                scan = max(scan, len(buffer) - 1)
+            else:
+                scan = match.start()
+            data = stream.read(block_size)
+            if not data:
+                at_eof = True
+            buffer += data
+            continue
+
+        scan = match.end()
+        token = match.group()
+        if token == '{':
+            depth += 1
+        elif token == '}':
+            depth -= 1
+            if depth <= 0:
+                depth = 0
+                text = buffer[:scan]
+                yield text, line, column
+                newlines = text.count('\n')
+                if newlines:
+                    line += newlines
+                    column = len(text) - text.rfind('\n') - 1
+                else:
+                    column += len(text)
+                buffer = buffer[scan:]
+                scan = 0
+
+    if buffer:
+        yield buffer, line, column
+
+
+class StreamingFrontend:
+    """Parses and interprets a script one top-level declaration at a time from a text stream.
+
+    Each block is lexed and parsed on its own (with token positions offset to its place
+    in the whole source), interpreted straight away and then dropped, so peak memory is
+    bounded by the model objects rather than by the parse tree or the source text.
+
+    The main block is only run once the whole stream has parsed cleanly, so nothing is
+    exported from a script with syntax errors. An interpreter error in a declaration is
+    held back while the rest of the stream is parsed (without interpreting it), so syntax
+    errors take precedence as in a full parse. Unlike the full parse, which reports every
+    syntax error, streaming stops at the first block with lexer or parser errors and only
+    reports those. Their payload is left in error_payload.
+    """
+
+    def __init__(self, lexer: str = 'antlr', block_size: int = 1 << 16, max_errors: int = None):
+        self.lexer = lexer
+        self.max_errors = max_errors
+        self.block_size = block_size
+        self.error_payload = None
+        self.blocks = 0
+
+    def run(self, stream, interpreter: TimelineInterpreter = None) -> TimelineInterpreter:
+        """Interpret every block of stream, returning the interpreter (interpreter exceptions propagate)"""
+        interpreter = interpreter or TimelineInterpreter()
+        parser = TimelineParser(None)
+        seen_main = False
+        main_tree = None
+        declaration_error = None  # raised once the rest of the stream has parsed cleanly
+        for text, line, column in iter_blocks(stream, self.block_size):
+            if TRAILING_TRIVIA.fullmatch(text):
+                continue
+
+            parser, lexer_listener, parser_listener = create_parser(text, self.lexer, (line, column), self.max_errors,
+                                                                    parser)
+            tokens = parser.getTokenStream()
+
+            subtree = None
+            try:
+                if seen_main:
+                    # Nothing may follow the main block
+                    token = tokens.LT(1)
+                    parser_listener.syntaxError(parser, token, token.line, token.column,
+                                                f"extraneous input {parser.getTokenErrorDisplay(token)} expecting <EOF>", None)
+                else:
+                    # Parsing each block as a program keeps error messages close to those of a full parse
+                    subtree = parser.program()
+            except ErrorBudgetExceeded:
+                pass
+
+            self.blocks += 1
+            self.error_payload = parse_error_payload(lexer_listener, parser_listener)
+            if self.error_payload:
+                return interpreter
+
+            if subtree.mainBlock() is not None:
+                seen_main = True
+                main_tree = subtree
+            elif declaration_error is None:
+                try:
+                    interpreter.visit(subtree)
+                except Exception as e:
+                    declaration_error = e
+
+        if declaration_error is not None:
+            raise declaration_error
+        if main_tree is not None:
+            interpreter.visit(main_tree)
+        return interpreter
@@ -0,0 +1,105 @@
+from collections.abc import MutableMapping
+
+EVENT = 'event'
+PERIOD = 'period'
+RELATIONSHIP = 'relationship'
+TIMELINE = 'timeline'
+KINDS = (EVENT, PERIOD, RELATIONSHIP, TIMELINE)
+
+
+class KindView(MutableMapping):
+    """Dict-like view of the symbols of one kind in a SymbolTable.
+
+    Reads go straight to a per-kind dict kept in step with the table, so len() and
+    iteration only cover this kind. Writes and deletes go through the table.
+    """
+
+    def __init__(self, table, kind: str):
+        self._table = table
+        self._kind = kind
+        self._objects = {}
+
+    def __getitem__(self, name):
+        return self._objects[name]
+
+    def __setitem__(self, name, obj):
+        self._table.declare(name, self._kind, obj)
+
+    def __delitem__(self, name):
+        if name not in self._objects:
+            raise KeyError(name)
+        self._table.remove(name)
+
+    def __contains__(self, name):
+        return name in self._objects
+
+    def __iter__(self):
+        return iter(self._objects)
+
+    def __len__(self):
+        return len(self._objects)
+
+    def get(self, name, default=None):
+        return self._objects.get(name, default)
+
+    def __repr__(self):
+        return f"KindView({self._kind!r}, {self._objects!r})"
+
+
+class SymbolTable:
+    """Maps every identifier to a (kind, object) entry so a name resolves with one hash probe.
+
+    Tables can be nested with child(); lookups walk from the innermost table outwards,
+    so a name declared in a child shadows the same name further out. Per-kind views
+    (view(EVENT), ...) expose the symbols of one kind as a dict for code that needs them.
+    """
+
+    def __init__(self, parent=None):
+        self.parent = parent
+        self._entries = {}
+        self._views = {kind: KindView(self, kind) for kind in KINDS}
+
+    def declare(self, name: str, kind: str, obj):
+        """Bind name to obj in this table, replacing any previous binding of name here"""
+        previous = self._entries.get(name)
+        if previous is not None and previous[0] != kind:
+            del self._views[previous[0]]._objects[name]
+        self._entries[name] = (kind, obj)
+        self._views[kind]._objects[name] = obj
+
+    def remove(self, name: str):
+        kind, _ = self._entries.pop(name)
+        del self._views[kind]._objects[name]
+
+    def lookup(self, name: str, kinds=None):
+        """Return the innermost (kind, object) entry for name, or None.
+
+        With kinds given, an entry of any other kind counts as not found.
+        """
+        table = self
+        while table is not None:
+            entry = table._entries.get(name)
+            if entry is not None:
+                return entry if kinds is None or entry[0] in kinds else None
+            table = table.parent
+        return None
+
+    def get(self, name: str, kinds=None):
+        """Return the object bound to name (restricted to kinds if given), or None"""
+        entry = self.lookup(name, kinds)
+        return entry[1] if entry is not None else None
+
+    def view(self, kind: str) -> KindView:
+        return self._views[kind]
+
+    def child(self):
+        return SymbolTable(self)
+
+    def __contains__(self, name):
+        return self.lookup(name) is not None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        return iter(self._entries)
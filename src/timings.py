@@ -0,0 +1,126 @@
+import functools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Timings of the request being handled in this thread, or None when timing is off
+_current = ContextVar('timings', default=None)
+
+
+class Timings:
+    """Wall time spent in each phase of one request, measured with perf_counter_ns.
+
+    Phases nest (draw runs inside the interpreter, the lexer inside the parser), and
+    each phase is charged only for the time not spent in the phases nested in it, so
+    the phases add up to the time measured inside them.
+    """
+
+    def __init__(self):
+        self.phases = {}  # phase name -> nanoseconds
+        self._stack = []  # open _Phase objects, innermost last
+        self._start = time.perf_counter_ns()
+        self._end = None
+
+    def add(self, name: str, nanoseconds: int):
+        self.phases[name] = self.phases.get(name, 0) + nanoseconds
+
+    def stop(self):
+        self._end = time.perf_counter_ns()
+
+    def to_dict(self) -> dict:
+        """Total and per-phase times in milliseconds"""
+        end = self._end if self._end is not None else time.perf_counter_ns()
+        return {
+            'total_ms': round((end - self._start) / 1e6, 3),
+            'phases_ms': {name: round(ns / 1e6, 3) for name, ns in self.phases.items()}
+        }
+
+
+class _Phase:
+    __slots__ = ('timings', 'name', 'start', 'nested')
+
+    def __init__(self, timings: Timings, name: str):
+        self.timings = timings
+        self.name = name
+
+    def __enter__(self):
+        self.nested = 0
+        self.timings._stack.append(self)
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter_ns() - self.start
+        stack = self.timings._stack
+        stack.pop()
+        self.timings.add(self.name, elapsed - self.nested)
+        if stack:
+            stack[-1].nested += elapsed
+        return False
+
+
+class _NoPhase:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NO_PHASE = _NoPhase()
+
+
+def phase(name: str):
+    """Context manager charging the time spent in its body to name (a no-op when timing is off)"""
+    timings = _current.get()
+    if timings is None:
+        return _NO_PHASE
+    return _Phase(timings, name)
+
+
+def timed(name: str):
+    """Decorator charging every call of the function to phase name"""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            timings = _current.get()
+            if timings is None:
+                return fn(*args, **kwargs)
+            with _Phase(timings, name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def time_lexer(lexer):
+    """Charge the lexer's nextToken calls to the lexer phase, if timing is on.
+
+    Tokens are produced on demand while the parser runs, so this is what separates
+    lexing from parsing without changing when the input is lexed.
+    """
+    timings = _current.get()
+    if timings is None:
+        return
+    next_token = lexer.nextToken
+
+    def timed_next_token():
+        with _Phase(timings, 'lexer'):
+            return next_token()
+    lexer.nextToken = timed_next_token
+
+
+@contextmanager
+def recording(enabled: bool = True):
+    """Record the phases run in the body into a new Timings, which is yielded (None when not enabled)"""
+    if not enabled:
+        yield None
+        return
+    timings = Timings()
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        timings.stop()
+        _current.reset(token)
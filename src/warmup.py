@@ -0,0 +1,78 @@
+import glob
+import os
+import time
+from antlr4 import InputStream, CommonTokenStream
+from src.TimelineLexer import TimelineLexer
+from src.TimelineParser import TimelineParser
+from src.parsing import parse_program
+
+# Exercises every lexer token and every parser rule/alternative at least once.
+# It only has to parse, so it is deliberately not semantically valid.
+WARMUP_SCRIPT = """
+// comment
+event e1 { title = "E1"; date = 1945; }
+event e2 { title = "E2"; date = 05-1945 CE; importance = high; }
+event e3 { title = "E3"; date = 08-05-1945 CE; importance = medium; }
+event e4 { title = "E4"; date = 356 BCE; importance = low; }
+event e5 { title = "E5"; date = e1.year + 5; }
+event e6 { title = "E6"; date = e2.month + 2; }
+event e7 { title = "E7"; date = e3.day + 1; }
+period p1 { title = "P1"; start = 03-44 BCE; end = 15-03-44 BCE; }
+period p2 { title = "P2"; start = 1900 CE; end = 1950 CE; importance = high; }
+timeline t1 { title = "T1"; e1, e2, p1; }
+relationship r1 { from = e1; to = e2; type = cause-effect; }
+relationship r2 { from = e1; to = e2; type = contemporaneous; }
+relationship r3 { from = e1; to = e2; type = precedes; }
+relationship r4 { from = e1; to = e2; type = follows; }
+relationship r5 { from = p1; to = e2; type = includes; }
+relationship r6 { from = p1; to = e2; type = excludes; }
+relationship r7 { from = e1; to = e2; type = "custom"; }
+main {
+    ;
+    export t1;
+    if (e1.date == 1945) { export e1; }
+    if (e1.title != "E1") { export e1; } else { export e2; }
+    if (e1.date < 01-1946 CE) { ; }
+    if (e1.date > 01-01-1900 CE) { ; }
+    if (e1.importance <= high) { ; }
+    if (p1.start >= 44 BCE) { ; }
+    if (p1.end == e2) { ; }
+    if (r1.type == medium) { ; }
+    if (e1.year == low) { ; }
+    if (e1.month == 5) { ; }
+    if (e1.day == e2.day) { ; }
+    if (e1) { ; }
+    if (true) { ; }
+    if (false) { ; } else { ; }
+    for c in t1 {
+        modify c { title = "X"; importance = low; }
+        modify c { date = 1950 CE; start = 1900; end = 2000 CE; }
+        export c;
+    }
+}
+"""
+
+
+def warm_up(example_dir: str = "input_examples", two_stage: bool = False):
+    """Parse the example corpus and WARMUP_SCRIPT to populate the shared ANTLR DFA caches.
+
+    The generated lexer and parser keep their DFA in class-level caches, so every
+    later TimelineLexer/TimelineParser instance in this process benefits.
+    Returns (number_of_scripts, elapsed_seconds).
+    """
+    scripts = [WARMUP_SCRIPT]
+    for path in sorted(glob.glob(os.path.join(example_dir, "*.timeline"))):
+        try:
+            with open(path, encoding='utf-8') as f:
+                scripts.append(f.read())
+        except OSError:
+            continue
+
+    start = time.perf_counter()
+    for code in scripts:
+        lexer = TimelineLexer(InputStream(code))
+        lexer.removeErrorListeners()
+        parser = TimelineParser(CommonTokenStream(lexer))
+        parser.removeErrorListeners()
+        parse_program(parser, two_stage=two_stage)
+    return len(scripts), time.perf_counter() - start
@@ -1,5 +1,10 @@
 let currentData = null;
 let editor = null;
+let lintTimer = null;
+let lintRequest = 0;
+
+// Delay after the last keystroke before the code is linted, in milliseconds
+const LINT_DELAY = 300;
 
 function setupEditor() {
     // Enable Ace language tools
@@ -28,6 +33,55 @@ function setupEditor() {
 
     // Set our custom Timeline mode
     editor.session.setMode("ace/mode/timeline");
+
+    // Lint while the user types, without rendering anything
+    editor.session.on('change', function() {
+        clearTimeout(lintTimer);
+        lintTimer = setTimeout(lint, LINT_DELAY);
+    });
+}
+
+function errorList(data) {
+    // Each error type keeps its list of errors under its own key
+    const keys = {
+        lexer_error: 'parser_errors',
+        parser_error: 'parser_errors',
+        validation_error: 'validation_errors',
+        name_error: 'name_errors',
+        lookup_error: 'lookup_errors',
+        type_error: 'type_errors',
+        attribute_error: 'attribute_errors'
+    };
+    return keys[data.error_type] ? data[keys[data.error_type]] || [] : [];
+}
+
+async function lint() {
+    const request = ++lintRequest;
+    try {
+        const response = await fetch('/validate', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify({ code: editor.getValue(), options: { first_error: true } })
+        });
+        const data = await response.json();
+
+        // Ignore answers that arrive after a newer lint request was sent
+        if (request !== lintRequest) {
+            return;
+        }
+        editor.getSession().setAnnotations(errorList(data)
+            .filter(error => error.line)
+            .map(error => ({
+                row: error.line - 1,
+                column: error.column,
+                text: error.message,
+                type: "error"
+            })));
+    } catch (error) {
+        // Linting is best effort; errors still show up when visualizing
+    }
 }
 
 function showError(message, errors = null, errorType = null) {
@@ -90,6 +144,27 @@ function clearError() {
     document.getElementById('error-message').style.display = 'none';
 }
 
+function imageSource(component) {
+    // Deferred images are rendered by the server the first time their URL is loaded
+    if (component.image_handle) {
+        return '/visualize/image/' + component.image_handle;
+    }
+    return 'data:image/png;base64,' + component.image;
+}
+
+async function showImageError(source, image, loadingOverlay) {
+    // The image endpoint answers a failed render with the same JSON error body as /visualize
+    loadingOverlay.classList.remove('active');
+    image.style.display = 'none';
+    try {
+        const response = await fetch(source);
+        const data = await response.json();
+        showError(data.error, data.error_details, data.error_type);
+    } catch (error) {
+        showError('Failed to load the timeline image. Please try again.', null, 'network_error');
+    }
+}
+
 function createComponentSelector(components) {
     const selector = document.getElementById('component-selector');
     selector.innerHTML = '';
@@ -150,8 +225,17 @@ function showComponent(component) {
     if (component.type === 'timeline') {
         // Show image tab and switch to it
         imageTabBtn.style.display = 'block';
-        document.getElementById('timeline-image').src = 'data:image/png;base64,' + component.image;
-        document.getElementById('timeline-image').style.display = 'block';
+        const image = document.getElementById('timeline-image');
+        const source = imageSource(component);
+        const loadingOverlay = document.querySelector('.loading-overlay');
+        if (component.image_handle && image.getAttribute('src') !== source) {
+            // Keep the spinner up while the server renders the image
+            loadingOverlay.classList.add('active');
+            image.onload = () => loadingOverlay.classList.remove('active');
+            image.onerror = () => showImageError(source, image, loadingOverlay);
+        }
+        image.src = source;
+        image.style.display = 'block';
         switchTab('image');
     } else {
         imageTabBtn.style.display = 'none';
@@ -214,7 +298,7 @@ function downloadImage() {
     if (!currentData || currentData.type !== 'timeline') return;
     
     const a = document.createElement('a');
-    a.href = 'data:image/png;base64,' + currentData.image;
+    a.href = imageSource(currentData);
     a.download = `${currentData.id}.png`;
     document.body.appendChild(a);
     a.click();
@@ -1,5 +1,10 @@
+import os
 from antlr4 import *
 from src import TimelineLexer, TimelineParser, TimelineInterpreter
+from src.parsing import parse_program
+
+# Parse in SLL mode first and fall back to full LL only on failure (opt-in, as in app.py)
+TWO_STAGE = os.environ.get('TIMELINE_PARSE_TWO_STAGE', '0').lower() in ('1', 'true', 'yes')
 
 
 def main():
@@ -7,7 +12,7 @@ def main():
     lexer = TimelineLexer(input_stream)
     tokens = CommonTokenStream(lexer)
     parser = TimelineParser(tokens)
-    tree = parser.program()
+    tree = parse_program(parser, two_stage=TWO_STAGE)
 
     visitor = TimelineInterpreter()
     visitor.visit(tree)